@@ -0,0 +1,41 @@
+"""add_security_audit_log_lookup_indexes
+
+Revision ID: 5c9a0e3f71d4
+Revises: b41e6c8d2f07
+Create Date: 2026-10-18 11:26:49.310872
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c9a0e3f71d4'
+down_revision: Union[str, Sequence[str], None] = 'b41e6c8d2f07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 1. Session timeline retrieval - covering index for index-only scans
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_audit_session_ts
+        ON security_audit_logs (session_id, timestamp)
+        INCLUDE (event_type, severity, hash_chain)
+    """)
+    
+    # 2. High/critical event retrieval by time range - partial index
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_audit_critical_ts
+        ON security_audit_logs (timestamp)
+        WHERE severity IN ('high', 'critical')
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_audit_critical_ts")
+    op.execute("DROP INDEX IF EXISTS ix_audit_session_ts")
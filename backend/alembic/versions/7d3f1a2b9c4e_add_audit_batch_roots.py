@@ -0,0 +1,42 @@
+"""add_audit_batch_roots
+
+Revision ID: 7d3f1a2b9c4e
+Revises: 14a8b9fe4122
+Create Date: 2026-10-18 10:12:41.204519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3f1a2b9c4e'
+down_revision: Union[str, Sequence[str], None] = '14a8b9fe4122'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Merkle roots sealing each flushed batch of security audit logs (RFC 6962)
+    op.create_table('audit_batch_roots',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('session_id', sa.String(), nullable=True),
+    sa.Column('batch_index', sa.Integer(), nullable=False),
+    sa.Column('first_event_id', sa.String(), nullable=False),
+    sa.Column('last_event_id', sa.String(), nullable=False),
+    sa.Column('leaf_count', sa.Integer(), nullable=False),
+    sa.Column('merkle_root', sa.String(length=64), nullable=False),
+    sa.Column('hash_algorithm', sa.String(length=20), nullable=False),
+    sa.Column('sealed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['pentesting_sessions.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('session_id', 'batch_index', name='uq_audit_batch_roots_session_batch')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('audit_batch_roots')
@@ -0,0 +1,42 @@
+"""security_audit_logs_context_jsonb
+
+Revision ID: b41e6c8d2f07
+Revises: 7d3f1a2b9c4e
+Create Date: 2026-10-18 11:03:17.582130
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41e6c8d2f07'
+down_revision: Union[str, Sequence[str], None] = '7d3f1a2b9c4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Store audit context as parsed JSONB so it can be filtered server-side (context->>'finding_id')
+    op.execute("""
+        ALTER TABLE security_audit_logs
+        ALTER COLUMN context TYPE JSONB USING context::jsonb
+    """)
+    
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_audit_context_gin
+        ON security_audit_logs USING gin (context jsonb_path_ops)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_audit_context_gin")
+    
+    op.execute("""
+        ALTER TABLE security_audit_logs
+        ALTER COLUMN context TYPE JSON USING context::json
+    """)
@@ -0,0 +1,100 @@
+"""security_audit_logs_event_type_smallint
+
+Revision ID: e2a7b5c19d36
+Revises: 5c9a0e3f71d4
+Create Date: 2026-10-18 11:58:04.771326
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7b5c19d36'
+down_revision: Union[str, Sequence[str], None] = '5c9a0e3f71d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Codes must match app.security.audit_logger.AuditEventType
+EVENT_TYPE_CODES = {
+    'session_started': 1,
+    'session_ended': 2,
+    'action_proposed': 3,
+    'action_approved': 4,
+    'action_denied': 5,
+    'action_executed': 6,
+    'scope_validation': 7,
+    'scope_violation': 8,
+    'tool_execution': 9,
+    'finding_discovered': 10,
+    'human_intervention': 11,
+    'phase_transition': 12,
+    'emergency_stop': 13,
+    'session_created': 20,
+    'login_success': 21,
+    'login_failed': 22,
+    'token_refresh': 23,
+    'user_info_access': 24,
+    'logout': 25,
+}
+
+
+def _sql_literal(value) -> str:
+    """Inline SQL literal for the fixed label/code constants above"""
+    return f"'{value}'" if isinstance(value, str) else str(value)
+
+
+def _convert_event_type(target_type: str, mapping: dict) -> None:
+    """Rewrite event_type through mapping, refusing to turn unmapped values into NULL"""
+    # Block concurrent writers between the check and the conversion
+    op.execute("LOCK TABLE security_audit_logs IN ACCESS EXCLUSIVE MODE")
+
+    unmapped = op.get_bind().execute(
+        sa.text(
+            "SELECT DISTINCT event_type FROM security_audit_logs "
+            "WHERE event_type IS NOT NULL AND event_type NOT IN :known"
+        ).bindparams(sa.bindparam("known", expanding=True)),
+        {"known": list(mapping)},
+    ).scalars().all()
+    if unmapped:
+        raise RuntimeError(
+            "security_audit_logs.event_type has values with no mapping, "
+            f"map them before re-running this migration: {sorted(unmapped, key=str)}"
+        )
+
+    whens = "\n".join(
+        f"                WHEN {_sql_literal(old)} THEN {_sql_literal(new)}"
+        for old, new in mapping.items()
+    )
+    op.execute(f"""
+        ALTER TABLE security_audit_logs
+        ALTER COLUMN event_type TYPE {target_type} USING (
+            CASE event_type
+{whens}
+            END
+        )
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Store AuditEventType as a SMALLINT code instead of its string label
+    _convert_event_type("SMALLINT", EVENT_TYPE_CODES)
+    
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_security_audit_logs_event_type
+        ON security_audit_logs (event_type)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_security_audit_logs_event_type")
+    
+    _convert_event_type(
+        "VARCHAR(100)",
+        {code: label for label, code in EVENT_TYPE_CODES.items()}
+    )
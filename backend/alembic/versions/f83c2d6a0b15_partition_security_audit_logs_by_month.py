@@ -0,0 +1,201 @@
+"""partition_security_audit_logs_by_month
+
+Revision ID: f83c2d6a0b15
+Revises: e2a7b5c19d36
+Create Date: 2026-10-18 13:41:22.906514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f83c2d6a0b15'
+down_revision: Union[str, Sequence[str], None] = 'e2a7b5c19d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Indexes on security_audit_logs (created on the parent, so every partition gets a local copy)
+AUDIT_LOG_INDEXES = {
+    "ix_audit_context_gin": "USING gin (context jsonb_path_ops)",
+    "ix_audit_session_ts": "(session_id, timestamp) INCLUDE (event_type, severity, hash_chain)",
+    "ix_audit_critical_ts": "(timestamp) WHERE severity IN ('high', 'critical')",
+    "ix_security_audit_logs_event_type": "(event_type)",
+}
+
+# Months of partitions created ahead of the current month
+PARTITIONS_AHEAD = 3
+
+
+def _copy_access_controls(source: str, target: str) -> str:
+    """SQL copying RLS state, policies and grants from one table to another"""
+    return f"""
+        DO $$
+        DECLARE
+            pol record;
+            grant_row record;
+        BEGIN
+            IF (SELECT relrowsecurity FROM pg_class WHERE oid = '{source}'::regclass) THEN
+                EXECUTE 'ALTER TABLE {target} ENABLE ROW LEVEL SECURITY';
+            END IF;
+            IF (SELECT relforcerowsecurity FROM pg_class WHERE oid = '{source}'::regclass) THEN
+                EXECUTE 'ALTER TABLE {target} FORCE ROW LEVEL SECURITY';
+            END IF;
+
+            FOR pol IN SELECT * FROM pg_policies WHERE schemaname = current_schema() AND tablename = '{source}' LOOP
+                EXECUTE format(
+                    'CREATE POLICY %I ON {target} AS %s FOR %s TO %s %s %s',
+                    pol.policyname,
+                    pol.permissive,
+                    pol.cmd,
+                    array_to_string(pol.roles, ', '),
+                    CASE WHEN pol.qual IS NOT NULL THEN 'USING (' || pol.qual || ')' ELSE '' END,
+                    CASE WHEN pol.with_check IS NOT NULL THEN 'WITH CHECK (' || pol.with_check || ')' ELSE '' END
+                );
+            END LOOP;
+
+            FOR grant_row IN
+                SELECT grantee, privilege_type FROM information_schema.role_table_grants
+                WHERE table_schema = current_schema() AND table_name = '{source}' AND grantee <> current_user
+            LOOP
+                EXECUTE format(
+                    'GRANT %s ON {target} TO %s',
+                    grant_row.privilege_type,
+                    CASE WHEN grant_row.grantee = 'PUBLIC' THEN 'PUBLIC' ELSE quote_ident(grant_row.grantee) END
+                );
+            END LOOP;
+        END $$;
+    """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Declarative monthly range partitioning on timestamp so recent-window queries
+    # (get_critical_audit_logs, session timelines) prune to the current partition.
+    # The existing table is attached as a single historical partition, so no rows are copied.
+
+    # 1. Partition key must be NOT NULL and part of the primary key.
+    #    Audit records are never back-dated, so rows without a timestamp block the migration.
+    op.execute("LOCK TABLE security_audit_logs IN ACCESS EXCLUSIVE MODE")
+    missing = op.get_bind().execute(
+        sa.text("SELECT count(*) FROM security_audit_logs WHERE timestamp IS NULL")
+    ).scalar()
+    if missing:
+        raise RuntimeError(
+            f"security_audit_logs has {missing} rows with a NULL timestamp, "
+            "resolve them before re-running this migration"
+        )
+    op.execute("ALTER TABLE security_audit_logs ALTER COLUMN timestamp SET NOT NULL")
+    op.execute("ALTER TABLE security_audit_logs ALTER COLUMN timestamp SET DEFAULT now()")
+
+    # 2. Move the current table aside (its indexes are renamed so the parent can reuse the names)
+    op.execute("ALTER TABLE security_audit_logs RENAME TO security_audit_logs_legacy")
+    op.execute("ALTER INDEX security_audit_logs_pkey RENAME TO security_audit_logs_legacy_pkey")
+    for name in AUDIT_LOG_INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS {name} RENAME TO {name}_legacy")
+    # A partition must carry the parent's key, so widen the legacy primary key before ATTACH
+    op.execute("""
+        ALTER TABLE security_audit_logs_legacy
+        DROP CONSTRAINT security_audit_logs_legacy_pkey,
+        ADD PRIMARY KEY (id, timestamp)
+    """)
+
+    # 3. Partitioned parent with the same columns, defaults and CHECK constraints
+    op.execute("""
+        CREATE TABLE security_audit_logs (
+            LIKE security_audit_logs_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+            PRIMARY KEY (id, timestamp),
+            FOREIGN KEY (session_id) REFERENCES pentesting_sessions (id)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    for name, definition in AUDIT_LOG_INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON security_audit_logs {definition}")
+    op.execute(_copy_access_controls("security_audit_logs_legacy", "security_audit_logs"))
+
+    # 4. Monthly partition helper (call monthly from cron/pg_cron to stay ahead)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION create_security_audit_log_partition(month_start date)
+        RETURNS text AS $$
+        DECLARE
+            partition_name text := format(
+                'security_audit_logs_y%sm%s', to_char(month_start, 'YYYY'), to_char(month_start, 'MM')
+            );
+            lower_bound timestamptz := date_trunc('month', month_start::timestamp) AT TIME ZONE 'UTC';
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF security_audit_logs FOR VALUES FROM (%L) TO (%L)',
+                partition_name, lower_bound, lower_bound + interval '1 month'
+            );
+            RETURN partition_name;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    # 5. Cold partitions can be moved (with their local indexes) to slower storage.
+    #    PostgreSQL has no read-only tablespaces, so writes are revoked on the partition instead.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION archive_security_audit_log_partition(partition_name text, target_tablespace name)
+        RETURNS void AS $$
+        DECLARE
+            index_name text;
+        BEGIN
+            EXECUTE format('ALTER TABLE %I SET TABLESPACE %I', partition_name, target_tablespace);
+            FOR index_name IN
+                SELECT indexrelid::regclass::text FROM pg_index WHERE indrelid = partition_name::regclass
+            LOOP
+                EXECUTE format('ALTER INDEX %s SET TABLESPACE %I', index_name, target_tablespace);
+            END LOOP;
+            EXECUTE format('REVOKE INSERT, UPDATE, DELETE ON %I FROM PUBLIC', partition_name);
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    # 6. Attach the old table as the historical partition, then pre-create upcoming months
+    op.execute(f"""
+        DO $$
+        DECLARE
+            first_month date := (date_trunc(
+                'month', GREATEST(now(), (SELECT max(timestamp) FROM security_audit_logs_legacy)) AT TIME ZONE 'UTC'
+            ) + interval '1 month')::date;
+        BEGIN
+            EXECUTE format(
+                'ALTER TABLE security_audit_logs ATTACH PARTITION security_audit_logs_legacy FOR VALUES FROM (MINVALUE) TO (%L)',
+                first_month::timestamp AT TIME ZONE 'UTC'
+            );
+            FOR i IN 0..{PARTITIONS_AHEAD} LOOP
+                PERFORM create_security_audit_log_partition((first_month + make_interval(months => i))::date);
+            END LOOP;
+        END $$
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS security_audit_logs_default PARTITION OF security_audit_logs DEFAULT
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE security_audit_logs RENAME TO security_audit_logs_partitioned")
+    op.execute("ALTER INDEX security_audit_logs_pkey RENAME TO security_audit_logs_partitioned_pkey")
+    for name in AUDIT_LOG_INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS {name} RENAME TO {name}_partitioned")
+
+    op.execute("""
+        CREATE TABLE security_audit_logs (
+            LIKE security_audit_logs_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+            PRIMARY KEY (id),
+            FOREIGN KEY (session_id) REFERENCES pentesting_sessions (id)
+        )
+    """)
+    op.execute("INSERT INTO security_audit_logs SELECT * FROM security_audit_logs_partitioned")
+    op.execute(_copy_access_controls("security_audit_logs_partitioned", "security_audit_logs"))
+    op.execute("ALTER TABLE security_audit_logs ALTER COLUMN timestamp DROP NOT NULL")
+
+    op.execute("DROP TABLE security_audit_logs_partitioned CASCADE")
+    for name, definition in AUDIT_LOG_INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON security_audit_logs {definition}")
+
+    op.execute("DROP FUNCTION IF EXISTS archive_security_audit_log_partition(text, name)")
+    op.execute("DROP FUNCTION IF EXISTS create_security_audit_log_partition(date)")
@@ -1,14 +1,51 @@
 """Agent Registry and Discovery System"""
 
+import ast
 import asyncio
 import logging
 from typing import Dict, List, Optional, Set
 from datetime import datetime, timedelta
 
+import orjson
 import redis.asyncio as redis
 from ..models.a2a_models import AgentCard
 from ..a2a_client.client import A2AClient
 
+_LEGACY_LITERALS = ((b"None", b"null"), (b"True", b"true"), (b"False", b"false"))
+
+
+def _legacy_repr_to_json(raw: bytes) -> bytes:
+    """Rewrite a legacy Python dict repr ({'key': 'value', 'flag': True}) as JSON
+
+    Only valid for reprs whose strings are all single-quoted with no escapes.
+    After swapping quotes, even-indexed segments between '"' are the structure
+    outside strings, so None/True/False are replaced there and never inside values.
+    """
+    parts = raw.replace(b"'", b'"').split(b'"')
+    structure = b"\x00".join(parts[::2])
+    for literal, json_literal in _LEGACY_LITERALS:
+        structure = structure.replace(literal, json_literal)
+    parts[::2] = structure.split(b"\x00")
+    return b'"'.join(parts)
+
+
+def load_agent_data(agent_data: bytes | str) -> Dict:
+    """Deserialize a stored agent card: JSON first, then legacy dict reprs"""
+    try:
+        return orjson.loads(agent_data)
+    except orjson.JSONDecodeError:
+        pass
+
+    raw = agent_data.encode('utf-8') if isinstance(agent_data, str) else agent_data
+    if b'"' not in raw and b"\\" not in raw and b"\x00" not in raw:
+        try:
+            return orjson.loads(_legacy_repr_to_json(raw))
+        except orjson.JSONDecodeError:
+            pass
+
+    # Escaped or double-quoted strings, tuples, sets etc.
+    return ast.literal_eval(raw.decode('utf-8'))
+
 
 class AgentRegistry:
     """Central agent registration and discovery system"""
@@ -22,12 +59,10 @@ class AgentRegistry:
         
     async def register_agent(self, agent_card: AgentCard) -> bool:
         """Register an agent in the registry"""
-        import json
-
         try:
             # Store agent card as proper JSON
             agent_key = f"{self.prefix}:agents:{agent_card.agent_id}"
-            agent_data = json.dumps(agent_card.to_dict())
+            agent_data = orjson.dumps(agent_card.to_dict())
             await self.redis.set(agent_key, agent_data)
             
             # Update capability index
@@ -163,21 +198,8 @@ class AgentRegistry:
     
     def _parse_agent_data(self, agent_data: bytes | str) -> Optional[AgentCard]:
         """Parse agent data from Redis with proper JSON deserialization"""
-        import json
-
         try:
-            # Handle bytes from Redis
-            if isinstance(agent_data, bytes):
-                agent_data = agent_data.decode('utf-8')
-
-            # Try parsing as JSON first
-            try:
-                data = json.loads(agent_data)
-            except json.JSONDecodeError:
-                # Fallback: Try to evaluate as Python dict representation
-                # This handles legacy format: {'key': 'value'} stored as string
-                import ast
-                data = ast.literal_eval(agent_data)
+            data = load_agent_data(agent_data)
 
             # Create AgentCard from parsed data
             return AgentCard(
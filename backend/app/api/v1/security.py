@@ -17,6 +17,7 @@ from datetime import datetime, timezone
 
 from ...agents import get_agent_manager
 from ...security import (
+    AuditEventType,
     EngagementScope,
     SecurityAction, 
     SecurityFinding,
@@ -568,6 +569,14 @@ async def get_finding_details(finding_id: str, db = Depends(get_db)):
 
 # Audit and Compliance
 
+def _event_type_label(code: int):
+    """Stored event type code -> label (unknown codes are returned as-is)"""
+    try:
+        return AuditEventType(code).label
+    except ValueError:
+        return code
+
+
 @router.get("/audit-logs", summary="Get audit logs") 
 async def get_audit_logs(
     session_id: Optional[str] = None,
@@ -585,7 +594,14 @@ async def get_audit_logs(
             query = query.filter(SecurityAuditLog.session_id == session_id)
         
         if event_type:
-            query = query.filter(SecurityAuditLog.event_type == event_type)
+            try:
+                event_type_code = AuditEventType(event_type).value
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown audit event type: {event_type}"
+                )
+            query = query.filter(SecurityAuditLog.event_type == event_type_code)
         
         if severity:
             query = query.filter(SecurityAuditLog.severity == severity)
@@ -597,7 +613,7 @@ async def get_audit_logs(
             "audit_logs": [
                 {
                     "id": log.id,
-                    "event_type": log.event_type,
+                    "event_type": _event_type_label(log.event_type),
                     "event_category": log.event_category,
                     "severity": log.severity,
                     "actor_type": log.actor_type,
@@ -613,6 +629,8 @@ async def get_audit_logs(
             "total_count": len(logs)
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get audit logs: {e}")
         raise HTTPException(
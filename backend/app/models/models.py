@@ -3,7 +3,8 @@ Core database models for MMCODE DevStrategist AI
 SQLAlchemy models for sessions, tasks, agents, and artifacts
 """
 
-from sqlalchemy import Column, String, DateTime, Text, JSON, Float, ForeignKey, Boolean, Integer, Enum
+from sqlalchemy import Column, String, DateTime, Text, JSON, Float, ForeignKey, Boolean, Integer, SmallInteger, Enum, UniqueConstraint, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 import uuid
@@ -358,12 +359,19 @@ class SecurityFinding(Base):
 class SecurityAuditLog(Base):
     """Security audit log for compliance"""
     __tablename__ = "security_audit_logs"
+    __table_args__ = (
+        Index("ix_audit_context_gin", "context", postgresql_using="gin", postgresql_ops={"context": "jsonb_path_ops"}),
+        # Session timeline lookups served as index-only scans
+        Index("ix_audit_session_ts", "session_id", "timestamp", postgresql_include=["event_type", "severity", "hash_chain"]),
+        # Partial index for high/critical event lookups by time range
+        Index("ix_audit_critical_ts", "timestamp", postgresql_where=text("severity IN ('high', 'critical')")),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     session_id = Column(String, ForeignKey("pentesting_sessions.id"))
     
     # Event details
-    event_type = Column(String(100), nullable=False)  # action_execution, scope_validation, session_started, etc.
+    event_type = Column(SmallInteger, nullable=False, index=True)  # AuditEventType code (session_started=1, ...)
     event_category = Column(String(50), default="security")
     severity = Column(String(20), default="info")  # debug, info, warning, error, critical
     
@@ -378,7 +386,7 @@ class SecurityAuditLog(Base):
     tool_name = Column(String(100))
     
     # Context and results
-    context = Column(JSON)
+    context = Column(JSON().with_variant(JSONB(), "postgresql"))  # JSONB on Postgres for GIN-indexed filtering
     result = Column(JSON)
     error_message = Column(Text)
     
@@ -387,7 +395,8 @@ class SecurityAuditLog(Base):
     previous_hash = Column(String(64))
     
     # Timing
-    timestamp = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    # Part of the primary key: the table is range-partitioned by month on timestamp
+    timestamp = Column(DateTime(timezone=True), primary_key=True, default=lambda: datetime.now(timezone.utc))
     
     # Relationships
     session = relationship("PentestingSession", back_populates="audit_logs")
@@ -396,6 +405,33 @@ class SecurityAuditLog(Base):
         return f"<SecurityAuditLog(id='{self.id}', event_type='{self.event_type}', timestamp='{self.timestamp}')>"
 
 
+class AuditBatchRoot(Base):
+    """RFC 6962 Merkle root sealing a batch of security audit log entries"""
+    __tablename__ = "audit_batch_roots"
+    __table_args__ = (
+        UniqueConstraint("session_id", "batch_index", name="uq_audit_batch_roots_session_batch"),
+    )
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    session_id = Column(String, ForeignKey("pentesting_sessions.id"))
+    
+    # Batch position and coverage
+    batch_index = Column(Integer, nullable=False)
+    first_event_id = Column(String, nullable=False)
+    last_event_id = Column(String, nullable=False)
+    leaf_count = Column(Integer, nullable=False)
+    
+    # Integrity
+    merkle_root = Column(String(64), nullable=False)
+    hash_algorithm = Column(String(20), nullable=False, default="sha256")
+    
+    # Timing
+    sealed_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<AuditBatchRoot(session_id='{self.session_id}', batch_index={self.batch_index}, leaf_count={self.leaf_count})>"
+
+
 class HumanApproval(Base):
     """Human approval records for security actions"""
     __tablename__ = "human_approvals"
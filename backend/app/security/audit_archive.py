@@ -0,0 +1,128 @@
+"""
+Audit Log Archival Sink
+=======================
+
+감사 이벤트 본문(context/result)을 Parquet 데이터셋으로 장기 보관
+- year=/month=/day=/event_type= hive 파티션, zstd 압축
+- 로컬 경로 또는 s3:// 등 pyarrow 파일시스템 URI 지원
+- DB에는 조회용 컬럼과 해시 체인만 유지하고 본문은 필요 시 Parquet에서 조회
+- 모든 파일을 고정 스키마로 기록/조회 (배치별 스키마 추론 시 전부 None인 컬럼이 null 타입이 되어 데이터셋 조회 실패)
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import orjson
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# Parquet으로 옮기고 DB 행에서는 비우는 컬럼
+ARCHIVED_COLUMNS = ("context", "result")
+
+# hive 파티션 컬럼 (디렉터리 이름으로만 저장)
+PARTITION_SCHEMA = pa.schema([
+    ("year", pa.int16()),
+    ("month", pa.int8()),
+    ("day", pa.int8()),
+    ("event_type", pa.string()),
+])
+
+# 아카이브 레코드 스키마 (SecurityAuditLogger._event_to_row 키 + 파티션 컬럼, context/result는 JSON 문자열)
+ARCHIVE_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("session_id", pa.string()),
+    ("severity", pa.string()),
+    ("actor_type", pa.string()),
+    ("actor_id", pa.string()),
+    ("action_id", pa.string()),
+    ("action_type", pa.string()),
+    ("target", pa.string()),
+    ("tool_name", pa.string()),
+    ("context", pa.string()),
+    ("result", pa.string()),
+    ("hash_chain", pa.string()),
+    ("previous_hash", pa.string()),
+    ("timestamp", pa.timestamp("us", tz="UTC")),
+    *PARTITION_SCHEMA,
+])
+
+_PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+
+
+class ParquetArchivalSink:
+    """감사 레코드 Parquet 아카이브 (SecurityAuditLogger flush 단위로 파일 1개 기록)"""
+
+    def __init__(self, root_uri: str, compression: str = "zstd"):
+        self.root_uri = root_uri
+        self.compression = compression
+        self.filesystem, self.root_path = pafs.FileSystem.from_uri(root_uri)
+
+    async def write(self, rows: List[Dict[str, Any]]):
+        """레코드 배치를 Parquet 파일로 기록 (블로킹 I/O는 스레드에서 실행)"""
+        if rows:
+            await asyncio.to_thread(self._write_sync, rows)
+
+    def _write_sync(self, rows: List[Dict[str, Any]]):
+        from .audit_logger import AuditEventType
+
+        records = []
+        for row in rows:
+            record = dict(row)
+            timestamp: datetime = record["timestamp"]
+            record["year"] = timestamp.year
+            record["month"] = timestamp.month
+            record["day"] = timestamp.day
+            record["event_type"] = AuditEventType(record["event_type"]).label
+            for column in ARCHIVED_COLUMNS:
+                value = record.get(column)
+                record[column] = (
+                    orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+                    if value is not None else None
+                )
+            records.append(record)
+
+        pq.write_to_dataset(
+            pa.Table.from_pylist(records, schema=ARCHIVE_SCHEMA),
+            root_path=self.root_path,
+            filesystem=self.filesystem,
+            partitioning=_PARTITIONING,
+            compression=self.compression,
+            basename_template=f"audit-{uuid.uuid4().hex}-{{i}}.parquet",
+        )
+
+    async def read_details(self, event_id: str, timestamp: datetime) -> Optional[Dict[str, Any]]:
+        """보관된 이벤트의 context/result 조회 (timestamp로 일 단위 파티션 pruning)"""
+        return await asyncio.to_thread(self._read_details_sync, event_id, timestamp)
+
+    def _read_details_sync(self, event_id: str, timestamp: datetime) -> Optional[Dict[str, Any]]:
+        dataset = ds.dataset(
+            self.root_path,
+            schema=ARCHIVE_SCHEMA,
+            filesystem=self.filesystem,
+            format="parquet",
+            partitioning=_PARTITIONING,
+        )
+        table = dataset.to_table(
+            columns=list(ARCHIVED_COLUMNS),
+            filter=(
+                (ds.field("year") == timestamp.year)
+                & (ds.field("month") == timestamp.month)
+                & (ds.field("day") == timestamp.day)
+                & (ds.field("id") == event_id)
+            ),
+        )
+        if table.num_rows == 0:
+            return None
+
+        row = table.slice(0, 1).to_pylist()[0]
+        return {
+            column: orjson.loads(row[column]) if row[column] is not None else None
+            for column in ARCHIVED_COLUMNS
+        }
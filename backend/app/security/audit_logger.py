@@ -15,31 +15,117 @@ import hashlib
 import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional, Union
+from typing import AsyncIterator, List, Dict, Any, Iterable, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import IntEnum
 import uuid
 
+import orjson
+from sqlalchemy import insert, select, text
+
 from .models import SecurityAction, ValidationResult, HumanApproval
+from .merkle import TreeHasher, inclusion_proof, leaf_hash, merkle_root, verify_inclusion
+from ..models.models import AuditBatchRoot, SecurityAuditLog
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
 
 logger = logging.getLogger(__name__)
 
+# 새 이벤트의 해시 알고리즘. 기존 로그는 이벤트별 hash_algorithm(기본 sha256)으로 검증
+DEFAULT_HASH_ALGORITHM = "blake3" if blake3 is not None else "sha256"
+if blake3 is None:
+    logger.warning("blake3 not installed, audit hash chain falls back to sha256")
+
+
+def _new_hasher(algorithm: str, data: bytes = b""):
+    """알고리즘별 hasher 생성"""
+    if algorithm == "blake3":
+        if blake3 is None:
+            raise ImportError("Please install: pip install blake3")
+        return blake3.blake3(data)
+    if algorithm == "sha256":
+        return hashlib.sha256(data)
+    raise ValueError(f"Unsupported audit hash algorithm: {algorithm}")
+
+
+def _digest(algorithm: str, data: bytes) -> bytes:
+    """해시 체인 다이제스트 계산"""
+    return _new_hasher(algorithm, data).digest()
+
+
+# 알고리즘별 Merkle TreeHasher (prefix 적용된 hasher를 copy()로 재사용)
+_TREE_HASHERS: Dict[str, TreeHasher] = {}
+
+
+def _tree_hasher(algorithm: str) -> TreeHasher:
+    """알고리즘별 TreeHasher 조회 (최초 사용 시 생성)"""
+    hasher = _TREE_HASHERS.get(algorithm)
+    if hasher is None:
+        hasher = _TREE_HASHERS[algorithm] = TreeHasher(_new_hasher(algorithm))
+    return hasher
+
+
+def _hexdigest(algorithm: str, data: bytes) -> str:
+    """해시 체인 다이제스트 (hex)"""
+    return _digest(algorithm, data).hex()
+
+
+# 해시 입력 정규화 옵션 (키 정렬, naive datetime은 UTC로 간주)
+_CANONICAL_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+
+def _canonical_bytes(algorithm: str, content: Dict[str, Any]) -> bytes:
+    """해시 입력 직렬화 - sha256 레거시 체인은 기존 json.dumps 형식 유지"""
+    if algorithm == "sha256":
+        return json.dumps(content, sort_keys=True).encode()
+    return orjson.dumps(content, option=_CANONICAL_OPTIONS)
 
-class AuditEventType(Enum):
-    """감사 이벤트 타입"""
-    SESSION_STARTED = "session_started"
-    SESSION_ENDED = "session_ended"
-    ACTION_PROPOSED = "action_proposed"
-    ACTION_APPROVED = "action_approved"
-    ACTION_DENIED = "action_denied"
-    ACTION_EXECUTED = "action_executed"
-    SCOPE_VALIDATION = "scope_validation"
-    SCOPE_VIOLATION = "scope_violation"
-    TOOL_EXECUTION = "tool_execution"
-    FINDING_DISCOVERED = "finding_discovered"
-    HUMAN_INTERVENTION = "human_intervention"
-    PHASE_TRANSITION = "phase_transition"
-    EMERGENCY_STOP = "emergency_stop"
+
+class AuditEventType(IntEnum):
+    """감사 이벤트 타입
+    
+    DB에는 SMALLINT 코드로 저장하고, 로그 파일/해시 입력에는 기존 문자열(label)을 사용
+    """
+    SESSION_STARTED = 1
+    SESSION_ENDED = 2
+    ACTION_PROPOSED = 3
+    ACTION_APPROVED = 4
+    ACTION_DENIED = 5
+    ACTION_EXECUTED = 6
+    SCOPE_VALIDATION = 7
+    SCOPE_VIOLATION = 8
+    TOOL_EXECUTION = 9
+    FINDING_DISCOVERED = 10
+    HUMAN_INTERVENTION = 11
+    PHASE_TRANSITION = 12
+    EMERGENCY_STOP = 13
+    
+    # 인증/API 감사 이벤트 (authentication.log_security_event)
+    SESSION_CREATED = 20
+    LOGIN_SUCCESS = 21
+    LOGIN_FAILED = 22
+    TOKEN_REFRESH = 23
+    USER_INFO_ACCESS = 24
+    LOGOUT = 25
+    
+    @property
+    def label(self) -> str:
+        """이벤트 타입 문자열 (예: session_started)"""
+        return _EVENT_TYPE_LABELS[self]
+    
+    @classmethod
+    def _missing_(cls, value):
+        # 문자열 label로 조회 허용 (JSONL 로그, API 필터)
+        if isinstance(value, str):
+            return _EVENT_TYPES_BY_LABEL.get(value)
+        return None
+
+
+_EVENT_TYPE_LABELS: Dict[AuditEventType, str] = {t: t.name.lower() for t in AuditEventType}
+_EVENT_TYPES_BY_LABEL: Dict[str, AuditEventType] = {label: t for t, label in _EVENT_TYPE_LABELS.items()}
 
 
 @dataclass
@@ -61,24 +147,36 @@ class AuditEvent:
     # 보안
     integrity_hash: Optional[str] = None
     previous_hash: Optional[str] = None
+    hash_algorithm: str = "sha256"
     
     # 메타데이터
     severity: str = "info"
     tags: List[str] = field(default_factory=list)
     
+    # 직렬화 캐시 (해시 계산과 파일 기록에 재사용)
+    _details_json: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    _timestamp_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """해시 계산"""
+        self._timestamp_iso = self.timestamp.isoformat()
         if not self.integrity_hash:
-            self.integrity_hash = self._calculate_hash()
+            if self.hash_algorithm != "sha256":
+                self._details_json = orjson.dumps(self.details, option=_CANONICAL_OPTIONS)
+            self.integrity_hash = self._calculate_hash(self._details_json, self._timestamp_iso)
     
-    def _calculate_hash(self) -> str:
-        """이벤트 무결성 해시 계산"""
+    def _calculate_hash(
+        self,
+        details_json: Optional[bytes] = None,
+        timestamp_iso: Optional[str] = None
+    ) -> str:
+        """이벤트 무결성 해시 계산 (캐시 미지정 시, 즉 검증 시에는 필드에서 재직렬화)"""
         content = {
             "event_id": self.event_id,
-            "event_type": self.event_type.value,
-            "timestamp": self.timestamp.isoformat(),
+            "event_type": self.event_type.label,
+            "timestamp": timestamp_iso or self.timestamp.isoformat(),
             "session_id": self.session_id,
-            "details": self.details,
+            "details": orjson.Fragment(details_json) if details_json is not None else self.details,
             "actor_type": self.actor_type,
             "actor_id": self.actor_id,
             "correlation_id": self.correlation_id,
@@ -88,20 +186,30 @@ class AuditEvent:
         if self.previous_hash:
             content["previous_hash"] = self.previous_hash
         
-        content_str = json.dumps(content, sort_keys=True)
-        return hashlib.sha256(content_str.encode()).hexdigest()
+        # 알고리즘 다운그레이드 방지 (sha256 레거시 이벤트는 기존 해시 유지)
+        if self.hash_algorithm != "sha256":
+            content["hash_algorithm"] = self.hash_algorithm
+        
+        return _hexdigest(self.hash_algorithm, _canonical_bytes(self.hash_algorithm, content))
     
     def verify_integrity(self) -> bool:
         """무결성 검증"""
         calculated_hash = self._calculate_hash()
         return calculated_hash == self.integrity_hash
     
+    def to_json_line(self) -> bytes:
+        """JSONL 한 줄 직렬화"""
+        data = self.to_dict()
+        if self._details_json is not None:
+            data["details"] = orjson.Fragment(self._details_json)
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    
     def to_dict(self) -> Dict[str, Any]:
         """딕셔너리로 변환"""
         return {
             "event_id": self.event_id,
-            "event_type": self.event_type.value,
-            "timestamp": self.timestamp.isoformat(),
+            "event_type": self.event_type.label,
+            "timestamp": self._timestamp_iso,
             "session_id": self.session_id,
             "details": self.details,
             "actor_type": self.actor_type,
@@ -109,11 +217,52 @@ class AuditEvent:
             "correlation_id": self.correlation_id,
             "integrity_hash": self.integrity_hash,
             "previous_hash": self.previous_hash,
+            "hash_algorithm": self.hash_algorithm,
             "severity": self.severity,
             "tags": self.tags,
         }
 
 
+# 단일 multi-VALUES INSERT로 보낼 최대 행 수 (초과 시 Postgres는 UNNEST)
+MULTI_VALUES_MAX_ROWS = 100
+
+# UNNEST INSERT 컬럼과 Postgres 배열 원소 타입 (_event_to_row 키와 일치)
+_UNNEST_COLUMNS = (
+    ("id", "TEXT"),
+    ("session_id", "TEXT"),
+    ("event_type", "SMALLINT"),
+    ("severity", "TEXT"),
+    ("actor_type", "TEXT"),
+    ("actor_id", "TEXT"),
+    ("action_id", "TEXT"),
+    ("action_type", "TEXT"),
+    ("target", "TEXT"),
+    ("tool_name", "TEXT"),
+    ("context", "JSONB"),
+    ("result", "JSON"),
+    ("hash_chain", "TEXT"),
+    ("previous_hash", "TEXT"),
+    ("timestamp", "TIMESTAMPTZ"),
+)
+
+_UNNEST_INSERT = text(
+    "INSERT INTO security_audit_logs (event_category, "
+    + ", ".join(f'"{name}"' for name, _ in _UNNEST_COLUMNS)
+    + ") SELECT 'security', * FROM unnest("
+    + ", ".join(f"CAST(:{name} AS {pg_type}[])" for name, pg_type in _UNNEST_COLUMNS)
+    + ")"
+)
+
+
+@dataclass
+class MerkleBatch:
+    """Merkle 루트로 봉인되는 감사 이벤트 배치"""
+    batch_index: int
+    event_ids: List[str] = field(default_factory=list)
+    leaves: List[bytes] = field(default_factory=list)
+    root: Optional[bytes] = None
+
+
 class SecurityAuditLogger:
     """
     보안 감사 로거
@@ -127,17 +276,55 @@ class SecurityAuditLogger:
         session_id: str,
         backend: str = "file",
         log_file: Optional[str] = None,
-        db_connection = None
+        session_factory = None,
+        flush_threshold: int = 50,
+        hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+        max_queue_size: int = 10_000,
+        max_wait_ms: int = 100,
+        archival_sink = None,
+        max_sealed_batches: int = 64,
+        max_pending_rows: int = 10_000,
+        dead_letter_file: Optional[str] = None
     ):
         self.session_id = session_id
         self.backend = backend
         self.log_file = log_file or f"audit_{session_id}.jsonl"
-        self.db_connection = db_connection
+        
+        # AsyncSession 팩토리 (async_sessionmaker). flush/조회마다 짧은 세션을 열어 사용하며
+        # 호출자의 세션은 공유하지 않음 (동시 태스크 간 AsyncSession 공유 불가)
+        self.session_factory = session_factory
+        
+        # DB 배치 저장 (bounded queue -> 단일 flusher 태스크가 일괄 INSERT + 단일 커밋)
+        self.flush_threshold = flush_threshold
+        self.max_wait_ms = max_wait_ms
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._flusher_task: Optional[asyncio.Task] = None
+        self._flushing = False
+        self._pending_rows: List[Dict[str, Any]] = []  # 쓰기 실패 후 재시도 대기
+        # 재시도 대기는 max_pending_rows개까지만 보관하고 초과분(가장 오래된 행)은 dead-letter 파일로 이동
+        self.max_pending_rows = max_pending_rows
+        self.dead_letter_file = dead_letter_file or f"audit_{session_id}.deadletter.jsonl"
+        self._dead_lettered_rows = 0
+        
+        # 장기 보관 (ParquetArchivalSink 등): context/result는 아카이브에만 두고 DB 행은 슬림하게 유지
+        # 아카이브 파일은 flush 단위로 생성되므로 사용 시 flush_threshold를 ~10k로 크게 잡을 것
+        self.archival_sink = archival_sink
+        # 아카이브 기록 실패 후 재시도 대기 (기록에 성공한 행은 슬림 행으로 _pending_rows에만 남음)
+        self._pending_archive: List[Dict[str, Any]] = []
         
         # 해시 체인 관리
+        self.hash_algorithm = hash_algorithm
         self._last_hash: Optional[str] = None
         self._event_count = 0
         
+        # Merkle 배치 관리 (배치 내부는 해시 체인, 배치 간은 Merkle 루트)
+        # 봉인된 배치는 최근 max_sealed_batches개만 메모리에 유지 (루트는 audit_batch_roots에 영속화)
+        self.max_sealed_batches = max_sealed_batches
+        self._open_batch = MerkleBatch(batch_index=0)
+        self._sealed_batches: Dict[int, MerkleBatch] = {}
+        self._leaf_index: Dict[str, Tuple[int, int]] = {}
+        self._pending_roots: List[Dict[str, Any]] = []
+        
         # 통계
         self._events_by_type: Dict[str, int] = {}
         self._total_events = 0
@@ -163,6 +350,7 @@ class SecurityAuditLogger:
             actor_id=actor_id,
             correlation_id=correlation_id,
             previous_hash=self._last_hash,
+            hash_algorithm=self.hash_algorithm,
             severity=severity,
             tags=tags or []
         )
@@ -331,10 +519,11 @@ class SecurityAuditLogger:
         # 해시 체인 업데이트
         self._last_hash = event.integrity_hash
         self._event_count += 1
+        self._add_leaf(event)
         
         # 통계 업데이트
-        self._events_by_type[event.event_type.value] = (
-            self._events_by_type.get(event.event_type.value, 0) + 1
+        self._events_by_type[event.event_type.label] = (
+            self._events_by_type.get(event.event_type.label, 0) + 1
         )
         self._total_events += 1
         
@@ -349,36 +538,376 @@ class SecurityAuditLogger:
                 self._write_to_database(event)
             )
         
-        logger.info(f"Audit event logged: {event.event_type.value} ({event.event_id})")
+        # critical 이벤트는 즉시 커밋, 그 외에는 배치 임계치 도달 시 봉인만 수행
+        if event.severity == "critical":
+            await self.flush()
+        elif len(self._open_batch.leaves) >= self.flush_threshold:
+            self._seal_open_batch()
+        
+        logger.info(f"Audit event logged: {event.event_type.label} ({event.event_id})")
     
     async def _write_to_file(self, event: AuditEvent):
         """파일에 이벤트 저장"""
         try:
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(event.to_dict()) + "\n")
+            with open(self.log_file, "ab") as f:
+                f.write(event.to_json_line())
         except Exception as e:
             logger.error(f"Failed to write audit event to file: {e}")
     
     async def _write_to_database(self, event: AuditEvent):
-        """데이터베이스에 이벤트 저장"""
-        if not self.db_connection:
-            logger.warning("Database connection not available for audit logging")
+        """데이터베이스 저장 대기열에 이벤트 추가 (큐가 가득 차면 대기)"""
+        if not self.session_factory:
+            logger.warning("Database session factory not available for audit logging")
+            return
+        
+        self._ensure_flusher()
+        await self._queue.put(event)
+    
+    def _ensure_flusher(self):
+        """flusher 태스크가 없거나 종료된 경우 (재)시작"""
+        if self._flusher_task is None or self._flusher_task.done():
+            self._flusher_task = asyncio.create_task(self._flusher_loop())
+    
+    async def _flusher_loop(self):
+        """큐에서 최대 flush_threshold개 또는 max_wait_ms까지 모아 한 번에 저장"""
+        loop = asyncio.get_running_loop()
+        while True:
+            events = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000
+            
+            while len(events) < self.flush_threshold:
+                try:
+                    events.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                
+                remaining = deadline - loop.time()
+                if self._flushing or remaining <= 0:
+                    break
+                try:
+                    async with asyncio.timeout(remaining):
+                        events.append(await self._queue.get())
+                except TimeoutError:
+                    break
+            
+            try:
+                await self._commit_rows([self._event_to_row(e) for e in events])
+            except Exception as e:
+                # 한 배치의 실패로 flusher가 죽으면 이후 flush()가 queue.join()에서 멈추므로 계속 진행
+                logger.exception(f"Audit flusher failed to write {len(events)} events: {e}")
+            finally:
+                for _ in events:
+                    self._queue.task_done()
+    
+    async def flush(self):
+        """열린 배치를 Merkle 루트로 봉인하고 큐에 쌓인 감사 레코드가 모두 커밋될 때까지 대기"""
+        self._seal_open_batch()
+        if not self.session_factory:
+            return
+        
+        self._flushing = True
+        try:
+            # 이전 배치에서 flusher가 종료됐다면 join이 끝나지 않으므로 먼저 재시작
+            self._ensure_flusher()
+            await self._queue.join()
+        finally:
+            self._flushing = False
+        
+        if self._pending_archive or self._pending_rows or self._pending_roots:
+            await self._commit_rows([])
+    
+    async def close(self):
+        """남은 레코드를 flush하고 flusher 태스크 종료"""
+        await self.flush()
+        if self._flusher_task is not None:
+            self._flusher_task.cancel()
+            try:
+                await self._flusher_task
+            except asyncio.CancelledError:
+                pass
+            self._flusher_task = None
+    
+    async def _commit_rows(self, rows: List[Dict[str, Any]]):
+        """감사 레코드와 봉인된 배치 루트를 flush 전용 세션으로 일괄 INSERT 후 한 번만 커밋"""
+        if self.archival_sink is not None:
+            rows = await self._archive_rows(rows)
+        rows = self._pending_rows + rows
+        self._pending_rows = []
+        roots, self._pending_roots = self._pending_roots, []
+        if not (rows or roots):
             return
         
-        # TODO: 실제 DB 연결 및 저장 로직 구현
+        committed = requeued = False
+        try:
+            async with self.session_factory() as session:
+                try:
+                    if rows:
+                        await self._insert_rows(session, rows)
+                    if roots:
+                        await session.execute(insert(AuditBatchRoot), roots)
+                    await session.commit()
+                    committed = True
+                except Exception:
+                    # 감사 레코드는 유실되면 안 되므로 롤백(연결 끊김 시 실패 가능)보다 먼저 재시도 대기열로 복귀
+                    self._retry_later(rows, roots)
+                    requeued = True
+                    # flush 세션만 롤백 (호출자 세션의 작업에는 영향 없음)
+                    try:
+                        await session.rollback()
+                    except Exception as e:
+                        logger.error(f"Failed to roll back audit flush session: {e}")
+                    raise
+        except Exception as e:
+            if committed:
+                logger.warning(f"Audit flush session failed to close after commit: {e}")
+                return
+            if not requeued:
+                self._retry_later(rows, roots)
+            logger.error(f"Failed to write {len(rows)} audit events to database: {e}")
+    
+    async def _archive_rows(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """아카이브 대기 행과 새 행을 한 번만 아카이브에 기록하고 DB에 넣을 슬림 행 반환
+        
+        아카이브 기록에 실패한 행은 DB INSERT 없이 _pending_archive에서 재시도하며,
+        기록에 성공한 행은 이후 DB 재시도에서 다시 아카이브되지 않음
+        """
+        rows = self._pending_archive + rows
+        self._pending_archive = []
+        if not rows:
+            return []
+        
         try:
-            # 예시 SQL
-            query = """
-                INSERT INTO security_audit_log 
-                (event_id, event_type, timestamp, session_id, details, 
-                 actor_type, actor_id, correlation_id, integrity_hash, 
-                 previous_hash, severity, tags)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            # await self.db_connection.execute(query, event.to_tuple())
-            pass
+            await self.archival_sink.write(rows)
         except Exception as e:
-            logger.error(f"Failed to write audit event to database: {e}")
+            logger.error(f"Failed to archive {len(rows)} audit events: {e}")
+            self._pending_archive = self._cap_retry_buffer(rows)
+            return []
+        return [{**row, "context": None, "result": None} for row in rows]
+    
+    def _retry_later(self, rows: List[Dict[str, Any]], roots: List[Dict[str, Any]]):
+        """실패한 행/루트를 재시도 대기열 앞에 되돌림"""
+        self._pending_rows = self._cap_retry_buffer(rows + self._pending_rows)
+        self._pending_roots[:0] = roots
+    
+    def _cap_retry_buffer(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """재시도 대기 행을 max_pending_rows개로 제한하고 초과분(가장 오래된 행)은 dead-letter 파일로 이동"""
+        overflow = len(rows) - self.max_pending_rows
+        if overflow <= 0:
+            return rows
+        dead, rows = rows[:overflow], rows[overflow:]
+        self._dead_lettered_rows += len(dead)
+        try:
+            with open(self.dead_letter_file, "ab") as f:
+                for row in dead:
+                    f.write(orjson.dumps(row, option=orjson.OPT_NON_STR_KEYS) + b"\n")
+        except Exception as e:
+            logger.critical(f"Dropped {len(dead)} audit events, dead-letter write to {self.dead_letter_file} failed: {e}")
+            return rows
+        logger.critical(
+            f"Audit retry buffer exceeded {self.max_pending_rows} rows, "
+            f"moved {len(dead)} oldest events to {self.dead_letter_file}"
+        )
+        return rows
+    
+    async def _insert_rows(self, session, rows: List[Dict[str, Any]]):
+        """감사 레코드 INSERT (ORM 객체/identity map 미사용, RETURNING 없음)
+        
+        - MULTI_VALUES_MAX_ROWS 이하: 단일 INSERT ... VALUES (...), (...)
+        - 초과 + PostgreSQL: 컬럼별 배열을 UNNEST로 펼쳐 단일 INSERT ... SELECT
+        - 그 외: executemany
+        """
+        if len(rows) <= MULTI_VALUES_MAX_ROWS:
+            await session.execute(insert(SecurityAuditLog).values(rows))
+            return
+        
+        connection = await session.connection()
+        if connection.dialect.name != "postgresql":
+            await session.execute(insert(SecurityAuditLog), rows)
+            return
+        
+        params = {}
+        for name, pg_type in _UNNEST_COLUMNS:
+            values = [row[name] for row in rows]
+            if pg_type in ("JSON", "JSONB"):
+                values = [
+                    orjson.dumps(v, option=orjson.OPT_NON_STR_KEYS).decode() if v is not None else None
+                    for v in values
+                ]
+            params[name] = values
+        await session.execute(_UNNEST_INSERT, params)
+    
+    @property
+    def _merkle_hasher(self) -> TreeHasher:
+        """Merkle 트리 hasher (이벤트 해시와 동일 알고리즘)"""
+        return _tree_hasher(self.hash_algorithm)
+    
+    def _add_leaf(self, event: AuditEvent):
+        """열린 배치에 이벤트 리프 추가"""
+        batch = self._open_batch
+        self._leaf_index[event.event_id] = (batch.batch_index, len(batch.leaves))
+        batch.event_ids.append(event.event_id)
+        batch.leaves.append(leaf_hash(bytes.fromhex(event.integrity_hash), self._merkle_hasher))
+    
+    def _seal_batch(self) -> Optional[MerkleBatch]:
+        """열린 배치의 Merkle 루트 계산 후 봉인"""
+        batch = self._open_batch
+        if not batch.leaves:
+            return None
+        
+        batch.root = merkle_root(batch.leaves, self._merkle_hasher)
+        self._sealed_batches[batch.batch_index] = batch
+        self._open_batch = MerkleBatch(batch_index=batch.batch_index + 1)
+        
+        # 가장 오래된 배치부터 리프/인덱스 해제
+        while len(self._sealed_batches) > self.max_sealed_batches:
+            evicted = self._sealed_batches.pop(next(iter(self._sealed_batches)))
+            for event_id in evicted.event_ids:
+                del self._leaf_index[event_id]
+        return batch
+    
+    def _seal_open_batch(self):
+        """열린 배치 봉인 후 DB 백엔드이면 루트 레코드를 저장 대기열에 추가"""
+        batch = self._seal_batch()
+        if batch is not None and self.backend != "file" and self.session_factory:
+            self._pending_roots.append(self._batch_to_row(batch))
+    
+    def _batch_to_row(self, batch: MerkleBatch) -> Dict[str, Any]:
+        """MerkleBatch를 audit_batch_roots 컬럼 매핑으로 변환"""
+        return {
+            "id": str(uuid.uuid4()),
+            "session_id": self.session_id,
+            "batch_index": batch.batch_index,
+            "first_event_id": batch.event_ids[0],
+            "last_event_id": batch.event_ids[-1],
+            "leaf_count": len(batch.leaves),
+            "merkle_root": batch.root.hex(),
+            "hash_algorithm": self.hash_algorithm,
+            "sealed_at": datetime.now(timezone.utc),
+        }
+    
+    def get_inclusion_proof(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """봉인된 배치 내 이벤트의 포함 증명 (log2(n)개의 형제 해시)
+        
+        아직 봉인되지 않았거나 메모리에서 해제된 배치의 이벤트는 None
+        """
+        position = self._leaf_index.get(event_id)
+        if position is None:
+            return None
+        
+        batch_index, leaf_idx = position
+        batch = self._sealed_batches.get(batch_index)
+        if batch is None:
+            # 아직 봉인되지 않은 배치
+            return None
+        
+        return {
+            "event_id": event_id,
+            "batch_index": batch_index,
+            "leaf_index": leaf_idx,
+            "tree_size": len(batch.leaves),
+            "audit_path": [h.hex() for h in inclusion_proof(batch.leaves, leaf_idx, self._merkle_hasher)],
+            "merkle_root": batch.root.hex(),
+            "hash_algorithm": self.hash_algorithm,
+        }
+    
+    @staticmethod
+    def verify_inclusion_proof(event: AuditEvent, proof: Dict[str, Any]) -> bool:
+        """이벤트 무결성 및 Merkle 루트 포함 여부 검증"""
+        if not event.verify_integrity() or event.event_id != proof["event_id"]:
+            return False
+        
+        hasher = _tree_hasher(proof["hash_algorithm"])
+        return verify_inclusion(
+            leaf_hash(bytes.fromhex(event.integrity_hash), hasher),
+            proof["leaf_index"],
+            proof["tree_size"],
+            [bytes.fromhex(h) for h in proof["audit_path"]],
+            bytes.fromhex(proof["merkle_root"]),
+            hasher
+        )
+    
+    @classmethod
+    async def bulk_import(
+        cls,
+        db_session,
+        events: Iterable[AuditEvent],
+        chunk_size: int = 5000
+    ) -> int:
+        """보관된 감사 이벤트 일괄 적재 (replay/backfill 전용, 온라인 log_* 경로와 별개)
+        
+        asyncpg 연결이면 COPY FROM STDIN(copy_records_to_table)을 사용하고,
+        그 외 드라이버는 executemany INSERT로 대체. 이벤트는 해시가 계산된 상태여야 함
+        """
+        connection = await db_session.connection()
+        use_copy = connection.dialect.driver == "asyncpg"
+        if use_copy:
+            raw = await connection.get_raw_connection()
+            table_columns = SecurityAuditLog.__table__.columns
+            columns = [column.name for column in table_columns]
+            # COPY는 ORM 컬럼 기본값을 적용하지 않으므로 스칼라 기본값을 직접 채움
+            defaults = {
+                column.name: column.default.arg
+                for column in table_columns
+                if column.default is not None and column.default.is_scalar
+            }
+        
+        imported = 0
+        chunk: List[Dict[str, Any]] = []
+        
+        async def _write(rows: List[Dict[str, Any]]):
+            if use_copy:
+                # asyncpg는 json/jsonb 값을 문자열로 전달해야 함
+                records = [
+                    tuple(
+                        orjson.dumps(row[c], option=orjson.OPT_NON_STR_KEYS).decode()
+                        if c in ("context", "result") and row.get(c) is not None
+                        else row.get(c, defaults.get(c))
+                        for c in columns
+                    )
+                    for row in rows
+                ]
+                await raw.driver_connection.copy_records_to_table(
+                    SecurityAuditLog.__tablename__, records=records, columns=columns
+                )
+            else:
+                await db_session.execute(insert(SecurityAuditLog), rows)
+        
+        for event in events:
+            chunk.append(cls._event_to_row(event))
+            if len(chunk) >= chunk_size:
+                await _write(chunk)
+                imported += len(chunk)
+                chunk = []
+        
+        if chunk:
+            await _write(chunk)
+            imported += len(chunk)
+        
+        await db_session.commit()
+        logger.info(f"Bulk imported {imported} audit events ({'COPY' if use_copy else 'INSERT'})")
+        return imported
+    
+    @staticmethod
+    def _event_to_row(event: AuditEvent) -> Dict[str, Any]:
+        """AuditEvent를 security_audit_logs 컬럼 매핑으로 변환"""
+        return {
+            "id": event.event_id,
+            "session_id": event.session_id,
+            "event_type": event.event_type.value,
+            "severity": event.severity,
+            "actor_type": event.actor_type,
+            "actor_id": event.actor_id,
+            "action_id": event.details.get("action_id"),
+            "action_type": event.details.get("action_type"),
+            "target": event.details.get("target"),
+            "tool_name": event.details.get("tool_name"),
+            "context": event.details,
+            "result": event.details.get("result"),
+            "hash_chain": event.integrity_hash,
+            "previous_hash": event.previous_hash,
+            "timestamp": event.timestamp,
+        }
     
     def _generate_event_id(self) -> str:
         """고유 이벤트 ID 생성"""
@@ -386,32 +915,35 @@ class SecurityAuditLogger:
     
     async def verify_chain_integrity(self) -> bool:
         """감사 로그 체인 무결성 검증"""
-        if self.backend != "file":
-            logger.warning("Chain verification only supported for file backend")
+        if self.backend == "database":
+            logger.warning("Chain verification requires the file backend (file or both)")
             return False
         
         try:
-            previous_hash = None
+            events = []
             with open(self.log_file, "r", encoding="utf-8") as f:
                 for line_num, line in enumerate(f, 1):
-                    event_data = json.loads(line.strip())
+                    event_data = orjson.loads(line)
+                    event_data["event_type"] = AuditEventType(event_data["event_type"])
+                    event_data["timestamp"] = datetime.fromisoformat(event_data["timestamp"])
+                    event = AuditEvent(**event_data)
                     
                     # 이벤트 무결성 검증
-                    event = AuditEvent(**{
-                        k: v for k, v in event_data.items() 
-                        if k not in ['integrity_hash']
-                    })
-                    
                     if not event.verify_integrity():
                         logger.error(f"Integrity check failed at line {line_num}")
                         return False
                     
-                    # 체인 연결 검증
-                    if previous_hash != event.previous_hash:
-                        logger.error(f"Chain break detected at line {line_num}")
-                        return False
-                    
-                    previous_hash = event.integrity_hash
+                    events.append(event)
+            
+            # 체인 연결 검증
+            if events and events[0].previous_hash is not None:
+                logger.error("Chain break detected at line 1")
+                return False
+            
+            mismatch = self.verify_chain_bulk(events)
+            if mismatch >= 0:
+                logger.error(f"Chain break detected at line {mismatch + 1}")
+                return False
             
             logger.info("Audit log chain integrity verified successfully")
             return True
@@ -420,6 +952,14 @@ class SecurityAuditLogger:
             logger.error(f"Chain verification failed: {e}")
             return False
     
+    @staticmethod
+    def verify_chain_bulk(events: Sequence[AuditEvent]) -> int:
+        """체인 연결 순차 검증 (previous_hash와 직전 integrity_hash 비교) - 첫 번째 끊긴 이벤트 인덱스 반환 (정상이면 -1)"""
+        for i in range(1, len(events)):
+            if events[i].previous_hash != events[i - 1].integrity_hash:
+                return i
+        return -1
+    
     def get_stats(self) -> Dict[str, Any]:
         """감사 로그 통계"""
         return {
@@ -427,10 +967,72 @@ class SecurityAuditLogger:
             "total_events": self._total_events,
             "events_by_type": self._events_by_type.copy(),
             "last_hash": self._last_hash,
+            "hash_algorithm": self.hash_algorithm,
+            "pending_db_rows": self._queue.qsize() + len(self._pending_archive) + len(self._pending_rows),
+            "dead_lettered_rows": self._dead_lettered_rows,
+            "sealed_batches": self._open_batch.batch_index,
             "backend": self.backend,
             "log_file": self.log_file,
         }
     
+    async def get_session_audit_logs(
+        self,
+        session_id: Optional[str] = None,
+        event_types: Optional[List[AuditEventType]] = None,
+        yield_per: int = 500
+    ) -> AsyncIterator[SecurityAuditLog]:
+        """세션 감사 로그 스트리밍 조회 (timestamp 순, yield_per 단위로 fetch)"""
+        if not self.session_factory:
+            logger.warning("Database session factory not available for audit log retrieval")
+            return
+        
+        query = select(SecurityAuditLog).where(
+            SecurityAuditLog.session_id == (session_id or self.session_id)
+        )
+        if event_types:
+            query = query.where(SecurityAuditLog.event_type.in_([et.value for et in event_types]))
+        query = query.order_by(SecurityAuditLog.timestamp).execution_options(yield_per=yield_per)
+        
+        async with self.session_factory() as session:
+            result = await session.stream_scalars(query)
+            async for row in result:
+                yield row
+    
+    async def get_critical_audit_logs(
+        self,
+        start_time: datetime,
+        end_time: Optional[datetime] = None,
+        yield_per: int = 500
+    ) -> AsyncIterator[SecurityAuditLog]:
+        """high/critical 감사 로그 스트리밍 조회 (전체 세션 대상)"""
+        if not self.session_factory:
+            logger.warning("Database session factory not available for audit log retrieval")
+            return
+        
+        query = select(SecurityAuditLog).where(
+            SecurityAuditLog.severity.in_(("high", "critical")),
+            SecurityAuditLog.timestamp >= start_time
+        )
+        if end_time is not None:
+            query = query.where(SecurityAuditLog.timestamp < end_time)
+        query = query.order_by(SecurityAuditLog.timestamp).execution_options(yield_per=yield_per)
+        
+        async with self.session_factory() as session:
+            result = await session.stream_scalars(query)
+            async for row in result:
+                yield row
+
+    async def get_event_details(self, row: SecurityAuditLog) -> Dict[str, Any]:
+        """감사 로그 행의 context/result 조회 (아카이브 사용 시 Parquet에서 로드)"""
+        if row.context is not None or self.archival_sink is None:
+            return {"context": row.context, "result": row.result}
+
+        details = await self.archival_sink.read_details(row.id, row.timestamp)
+        if details is None:
+            logger.warning(f"Archived details not found for audit event {row.id}")
+            return {"context": None, "result": None}
+        return details
+
     async def search_events(
         self,
         event_types: Optional[List[AuditEventType]] = None,
@@ -441,18 +1043,18 @@ class SecurityAuditLogger:
         limit: int = 100
     ) -> List[AuditEvent]:
         """이벤트 검색"""
-        if self.backend != "file":
-            logger.warning("Event search only supported for file backend")
+        if self.backend == "database":
+            logger.warning("Event search requires the file backend (file or both)")
             return []
         
         events = []
         try:
             with open(self.log_file, "r", encoding="utf-8") as f:
                 for line in f:
-                    event_data = json.loads(line.strip())
+                    event_data = orjson.loads(line)
                     
                     # 필터링 조건 적용
-                    if event_types and event_data["event_type"] not in [et.value for et in event_types]:
+                    if event_types and event_data["event_type"] not in [et.label for et in event_types]:
                         continue
                     
                     event_time = datetime.fromisoformat(event_data["timestamp"].replace('Z', '+00:00'))
@@ -486,7 +1088,8 @@ def create_audit_logger(
     session_id: str,
     backend: str = "file",
     log_file: Optional[str] = None,
-    db_connection = None
+    session_factory = None,
+    flush_threshold: int = 50
 ) -> SecurityAuditLogger:
     """
     감사 로거 생성
@@ -495,7 +1098,8 @@ def create_audit_logger(
         session_id: 세션 ID
         backend: 저장 백엔드 ("file", "database", "both")
         log_file: 로그 파일 경로 (파일 백엔드용)
-        db_connection: DB 연결 (DB 백엔드용)
+        session_factory: DB 세션 팩토리 (DB 백엔드용, async_sessionmaker)
+        flush_threshold: DB 일괄 저장 단위 (이벤트 수)
     
     Returns:
         SecurityAuditLogger 인스턴스
@@ -504,5 +1108,6 @@ def create_audit_logger(
         session_id=session_id,
         backend=backend,
         log_file=log_file,
-        db_connection=db_connection
+        session_factory=session_factory,
+        flush_threshold=flush_threshold
     )
\ No newline at end of file
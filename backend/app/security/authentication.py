@@ -402,9 +402,10 @@ async def log_security_event(
 ) -> None:
     """Log security events for audit trail"""
     from app.models.models import SecurityAuditLog
+    from app.security.audit_logger import AuditEventType
     
     audit_log = SecurityAuditLog(
-        event_type=event_type,
+        event_type=AuditEventType(event_type).value,
         event_category="security",
         severity="info" if result == "success" else "warning",
         actor_type="human",
@@ -0,0 +1,126 @@
+"""
+Merkle Tree Helpers
+===================
+
+RFC 6962 (Certificate Transparency) Merkle tree 계산
+- 리프 해시: H(0x00 || data)
+- 내부 노드: H(0x01 || left || right)
+- 포함 증명(audit path) 생성/검증: O(log n)
+
+감사 로그 배치 루트 봉인에 사용
+"""
+
+import hashlib
+from typing import List, Sequence
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+class TreeHasher:
+    """리프/노드 prefix를 미리 넣어 둔 hasher를 copy()해 재사용
+    
+    base: 비어 있는 hashlib 호환 hasher (hashlib.sha256(), blake3.blake3() 등)
+    """
+    
+    def __init__(self, base):
+        self._empty = base.copy().digest()
+        self._leaf = base.copy()
+        self._leaf.update(LEAF_PREFIX)
+        self._node = base.copy()
+        self._node.update(NODE_PREFIX)
+    
+    def empty(self) -> bytes:
+        """빈 트리 해시"""
+        return self._empty
+    
+    def leaf(self, data: bytes) -> bytes:
+        """H(0x00 || data)"""
+        h = self._leaf.copy()
+        h.update(data)
+        return h.digest()
+    
+    def node(self, left: bytes, right: bytes) -> bytes:
+        """H(0x01 || left || right)"""
+        h = self._node.copy()
+        h.update(left)
+        h.update(right)
+        return h.digest()
+
+
+SHA256_TREE_HASHER = TreeHasher(hashlib.sha256())
+
+
+def leaf_hash(data: bytes, hasher: TreeHasher = SHA256_TREE_HASHER) -> bytes:
+    """리프 해시 계산"""
+    return hasher.leaf(data)
+
+
+def node_hash(left: bytes, right: bytes, hasher: TreeHasher = SHA256_TREE_HASHER) -> bytes:
+    """내부 노드 해시 계산"""
+    return hasher.node(left, right)
+
+
+def _split_point(n: int) -> int:
+    """n보다 작은 가장 큰 2의 거듭제곱"""
+    return 1 << ((n - 1).bit_length() - 1)
+
+
+def merkle_root(leaves: Sequence[bytes], hasher: TreeHasher = SHA256_TREE_HASHER) -> bytes:
+    """리프 해시 목록으로부터 Merkle 루트 계산"""
+    if not leaves:
+        return hasher.empty()
+    if len(leaves) == 1:
+        return leaves[0]
+    k = _split_point(len(leaves))
+    return node_hash(
+        merkle_root(leaves[:k], hasher),
+        merkle_root(leaves[k:], hasher),
+        hasher
+    )
+
+
+def inclusion_proof(
+    leaves: Sequence[bytes],
+    index: int,
+    hasher: TreeHasher = SHA256_TREE_HASHER
+) -> List[bytes]:
+    """index 위치 리프의 포함 증명 (리프에서 루트 방향 형제 해시 목록)"""
+    if not 0 <= index < len(leaves):
+        raise IndexError(f"Leaf index {index} out of range for tree of size {len(leaves)}")
+    if len(leaves) == 1:
+        return []
+    k = _split_point(len(leaves))
+    if index < k:
+        return inclusion_proof(leaves[:k], index, hasher) + [merkle_root(leaves[k:], hasher)]
+    return inclusion_proof(leaves[k:], index - k, hasher) + [merkle_root(leaves[:k], hasher)]
+
+
+def verify_inclusion(
+    leaf: bytes,
+    index: int,
+    tree_size: int,
+    proof: Sequence[bytes],
+    root: bytes,
+    hasher: TreeHasher = SHA256_TREE_HASHER
+) -> bool:
+    """포함 증명 검증 (RFC 6962 2.1.1 / RFC 9162 2.1.3.2)"""
+    if not 0 <= index < tree_size:
+        return False
+
+    fn, sn = index, tree_size - 1
+    result = leaf
+    for sibling in proof:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            result = node_hash(sibling, result, hasher)
+            while fn and not fn & 1:
+                fn >>= 1
+                sn >>= 1
+        else:
+            result = node_hash(result, sibling, hasher)
+        fn >>= 1
+        sn >>= 1
+
+    return sn == 0 and result == root
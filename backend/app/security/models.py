@@ -226,7 +226,7 @@ class EngagementScope:
         return method in self.allowed_methods
 
 
-@dataclass
+@dataclass(slots=True)
 class SecurityAction:
     """
     보안 작업 정의
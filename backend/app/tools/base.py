@@ -11,7 +11,7 @@ import shlex
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 from pathlib import Path
 import json
 
@@ -42,6 +42,8 @@ class ToolResult:
     findings: List[Dict[str, Any]] = field(default_factory=list)
     targets_discovered: List[str] = field(default_factory=list)
     services_discovered: List[Dict[str, Any]] = field(default_factory=list)
+    # services_discovered grouped by (port, protocol); one entry per host on multi-host scans
+    services_by_port: Dict[Tuple[int, str], List[Dict[str, Any]]] = field(default_factory=dict)
     
     # Metadata
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
@@ -165,6 +167,7 @@ class BaseSecurityTool(ABC):
             # Extract discovered targets and services
             targets_discovered = self._extract_targets(findings)
             services_discovered = self._extract_services(findings)
+            services_by_port = self._index_services(services_discovered)
             
             return ToolResult(
                 tool_name=self.tool_name,
@@ -177,6 +180,7 @@ class BaseSecurityTool(ABC):
                 findings=findings,
                 targets_discovered=targets_discovered,
                 services_discovered=services_discovered,
+                services_by_port=services_by_port,
                 output_files=output_files
             )
             
@@ -265,6 +269,15 @@ class BaseSecurityTool(ABC):
         
         return services
     
+    def _index_services(self, services: List[Dict[str, Any]]) -> Dict[Tuple[int, str], List[Dict[str, Any]]]:
+        """Group discovered services by (port, protocol) for O(1) lookups, keeping every host"""
+        services_by_port = {}
+        
+        for service in services:
+            services_by_port.setdefault((service["port"], service["protocol"]), []).append(service)
+        
+        return services_by_port
+    
     def sanitize_target(self, target: str) -> str:
         """Sanitize target input to prevent command injection"""
         # Basic sanitization - expand as needed
@@ -12,6 +12,8 @@ import xml.etree.ElementTree as ET
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+from lxml import etree
+
 from .base import BaseSecurityTool, ToolError
 from ..security.scope_enforcer import ScopeEnforcementEngine
 from ..security.models import SecurityAction, generate_action_id, PentestPhase
@@ -214,14 +216,22 @@ class NmapTool(BaseSecurityTool):
         return findings
     
     def _parse_xml_output(self, xml_file: str) -> List[Dict[str, Any]]:
-        """Parse nmap XML output"""
+        """Parse nmap XML output
+        
+        Streams <host> elements with iterparse and discards each one once its
+        findings are extracted, so memory stays flat regardless of host count.
+        """
         findings = []
         
         try:
-            tree = ET.parse(xml_file)
-            root = tree.getroot()
-            
-            for host in root.findall('host'):
+            hosts = etree.iterparse(
+                xml_file,
+                events=("end",),
+                tag="host",
+                resolve_entities=False,
+                no_network=True
+            )
+            for _, host in hosts:
                 # Get host information
                 host_info = self._extract_host_info(host)
                 
@@ -241,6 +251,11 @@ class NmapTool(BaseSecurityTool):
                 # Get script results
                 script_findings = self._extract_script_results(host, host_info)
                 findings.extend(script_findings)
+                
+                # Drop the processed host and any siblings already parsed
+                host.clear()
+                while host.getprevious() is not None:
+                    del host.getparent()[0]
         
         except Exception as e:
             self.logger.warning(f"Failed to parse nmap XML: {e}")
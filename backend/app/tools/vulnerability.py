@@ -10,6 +10,7 @@ Integration for vulnerability scanning and web application testing:
 import json
 import re
 import asyncio
+import orjson
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 from datetime import datetime
@@ -151,9 +152,8 @@ class NucleiTool(BaseSecurityTool):
         """Create temporary target list file"""
         target_file = self.output_dir / f"targets_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
         
-        with open(target_file, 'w') as f:
-            for target in targets:
-                f.write(f"{target}\n")
+        # One write for the whole list instead of a buffered write per target
+        target_file.write_text("".join(f"{target}\n" for target in targets))
         
         return str(target_file)
     
@@ -271,18 +271,18 @@ class NucleiTool(BaseSecurityTool):
         findings = []
         
         try:
-            with open(json_file, 'r') as f:
+            with open(json_file, 'rb') as f:
                 for line in f:
                     line = line.strip()
                     if not line:
                         continue
                     
                     try:
-                        result = json.loads(line)
+                        result = orjson.loads(line)
                         finding = self._convert_nuclei_result(result)
                         if finding:
                             findings.append(finding)
-                    except json.JSONDecodeError:
+                    except orjson.JSONDecodeError:
                         continue
         
         except Exception as e:
@@ -0,0 +1,108 @@
+"""
+Shared pytest fixtures for the MMCODE backend test suite
+========================================================
+
+Database fixtures build the SQLAlchemy schema once per xdist worker and cache
+it on disk under ``.pytest_cache/schema_{worker}.sqlite``. Each ``test_engine``
+then clones that file into a fresh in-memory aiosqlite database with
+``aiosqlite.Connection.backup`` instead of re-running ``create_all``.
+
+Async tests run on uvloop when it is installed, matching production.
+"""
+
+import asyncio
+import os
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from fakes import FakeAsyncSession
+
+SCHEMA_CACHE_DIR = Path(__file__).resolve().parent.parent / ".pytest_cache"
+
+
+def _schema_cache_path() -> Path:
+    """Per-worker schema cache file, so parallel workers never contend on it"""
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "master")
+    return SCHEMA_CACHE_DIR / f"schema_{worker}.sqlite"
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Use uvloop's event loop policy when available, else the stdlib default"""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+@pytest.fixture(scope="session")
+def schema_cache():
+    """Materialize the ORM schema into the worker's cache file once per session"""
+    from app.db.session import Base
+    import app.models.models  # noqa: F401  (registers all tables on Base.metadata)
+
+    path = _schema_cache_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        path.unlink()
+
+    sync_engine = create_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(sync_engine)
+    finally:
+        sync_engine.dispose()
+
+    yield path
+
+
+@pytest.fixture
+async def test_engine(schema_cache):
+    """In-memory aiosqlite engine pre-populated from the cached schema"""
+    import aiosqlite
+
+    async def _clone_schema():
+        # The backup runs on the source connection's worker thread, so the target
+        # must allow use outside its own thread
+        conn = await aiosqlite.connect(":memory:", check_same_thread=False)
+        async with aiosqlite.connect(schema_cache) as source:
+            await source.backup(conn)
+        return conn
+
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        async_creator=_clone_schema,
+        poolclass=StaticPool,
+    )
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db_session(test_engine):
+    """Async session bound to the per-test in-memory database"""
+    session_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+def mock_db_session():
+    """Fake AsyncSession with fresh add/commit/rollback/refresh/delete/execute mocks"""
+    return FakeAsyncSession()
+
+
+@pytest.fixture(scope="module")
+def prebuilt_client():
+    """InMemoryA2AClient with the orchestration agents registered (treat as read-only)"""
+    from app.agents.shared.a2a_client.mock_client import InMemoryA2AClient
+
+    client = InMemoryA2AClient()
+    for name in ("requirement-analyzer", "architect", "stack_recommender", "documenter"):
+        client.register(name, Mock(spec=["handle_task"]))
+    return client
@@ -0,0 +1,21 @@
+"""
+Hand-written test doubles shared across the backend test suite
+==============================================================
+
+Plain classes standing in for heavyweight dependencies where a spec'd
+``Mock`` would introspect the whole real API on every construction.
+"""
+
+from unittest.mock import AsyncMock, Mock
+
+
+class FakeAsyncSession:
+    """Stand-in for sqlalchemy's AsyncSession exposing only what services call"""
+
+    def __init__(self):
+        self.add = Mock()
+        self.commit = AsyncMock()
+        self.rollback = AsyncMock()
+        self.refresh = AsyncMock()
+        self.delete = AsyncMock()
+        self.execute = AsyncMock()
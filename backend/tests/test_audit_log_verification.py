@@ -14,16 +14,44 @@ This test validates the complete audit logging system including:
 
 import pytest
 import asyncio
-import json
+import dataclasses
 from datetime import datetime, timezone, timedelta
 from unittest.mock import Mock, AsyncMock, patch
-from sqlalchemy.ext.asyncio import AsyncSession
+import orjson
+import pyarrow.parquet as pq
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.security.audit_logger import SecurityAuditLogger, AuditEvent, AuditEventType
+from app.security.audit_logger import (
+    MULTI_VALUES_MAX_ROWS,
+    SecurityAuditLogger,
+    AuditEvent,
+    AuditEventType,
+    _UNNEST_COLUMNS,
+)
 from app.security.approval_integration import ApprovalIntegrationManager
+from app.security.audit_archive import ParquetArchivalSink
 from app.security.models import SecurityAction, generate_action_id, PentestPhase, RiskLevel
 from app.tools.base import BaseSecurityTool, ToolResult
-from app.models.models import SecurityAuditLog, Session, HumanApproval
+from app.models.models import AuditBatchRoot, SecurityAuditLog, Session, HumanApproval
+
+
+_ACTION_TEMPLATE = SecurityAction(
+    action_id="action_template",
+    action_type="vulnerability_scan",
+    target="192.168.1.100",
+    tool_name="nuclei",
+    method="cve_scan",
+    phase=PentestPhase.SCANNING,
+    risk_level=RiskLevel.MEDIUM,
+    created_by="security_analyst_1"
+)
+
+
+def make_action(**overrides):
+    """Copy the CVE scan action template with a fresh action_id and any field overrides"""
+    fields = {"action_id": generate_action_id(), "parameters": {}, **overrides}
+    return dataclasses.replace(_ACTION_TEMPLATE, **fields)
 
 
 class TestAuditLogVerification:
@@ -66,17 +94,7 @@ class TestAuditLogVerification:
     @pytest.fixture
     def sample_security_action(self):
         """Sample security action for audit testing"""
-        return SecurityAction(
-            action_id=generate_action_id(),
-            action_type="vulnerability_scan",
-            target="192.168.1.100",
-            tool_name="nuclei",
-            method="cve_scan",
-            phase=PentestPhase.SCANNING,
-            risk_level=RiskLevel.MEDIUM,
-            justification="CVE scanning for critical vulnerabilities",
-            requested_by="security_analyst_1"
-        )
+        return make_action()
 
     @pytest.mark.asyncio
     async def test_complete_audit_workflow_coverage(
@@ -256,15 +274,13 @@ class TestAuditLogVerification:
         session_id = sample_security_session.session_id
         
         # High-risk action requiring approval
-        high_risk_action = SecurityAction(
+        high_risk_action = make_action(
             action_id="high_risk_001",
-            action_type="exploit_execution", 
-            target="192.168.1.100",
+            action_type="exploit_execution",
             tool_name="metasploit",
             method="reverse_shell",
             phase=PentestPhase.EXPLOITATION,
-            risk_level=RiskLevel.HIGH,
-            requires_approval=True
+            risk_level=RiskLevel.HIGH
         )
         
         # Log approval request
@@ -429,7 +445,7 @@ class TestAuditLogVerification:
                 event_type=AuditEventType.SESSION_STARTED.value,
                 session_id="test_session",
                 timestamp=datetime.now(timezone.utc),
-                context=json.dumps({"user_id": "analyst_1"}),
+                context={"user_id": "analyst_1"},
                 integrity_hash="hash_001",
                 severity="info"
             ),
@@ -439,7 +455,7 @@ class TestAuditLogVerification:
                 event_type=AuditEventType.FINDING_DISCOVERED.value,
                 session_id="test_session",
                 timestamp=datetime.now(timezone.utc),
-                context=json.dumps({"finding_id": "CVE_2021_44228"}),
+                context={"finding_id": "CVE_2021_44228"},
                 integrity_hash="hash_002",
                 severity="critical"
             )
@@ -543,5 +559,470 @@ class TestAuditLogVerification:
         # If previous event was tampered, hash chain should be detectable
         assert event2.previous_hash == original_hash  # Should reference original, not tampered
 
+
+def _spy_commits():
+    """Count commits on every AsyncSession (the logger commits on its own flush sessions)"""
+    return patch.object(AsyncSession, "commit", autospec=True, side_effect=AsyncSession.commit)
+
+
+class TestAuditLoggerDatabaseBackend:
+    """Database backend of SecurityAuditLogger against the in-memory test schema"""
+
+    @pytest.fixture
+    def audit_session_factory(self, test_engine):
+        """Session factory for the logger's short-lived flush/read sessions"""
+        return async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+
+    @pytest.fixture
+    async def db_audit_logger(self, audit_session_factory):
+        """Database-backed audit logger flushing every 4 events"""
+        audit_logger = SecurityAuditLogger(
+            session_id="db_backend_session",
+            backend="database",
+            session_factory=audit_session_factory,
+            flush_threshold=4
+        )
+        yield audit_logger
+        await audit_logger.close()
+
+    async def test_events_are_batched_into_single_commits(self, db_audit_logger, db_session):
+        """Test that rows are bulk inserted once per batch instead of committed per event"""
+        
+        with _spy_commits() as commit_spy:
+            for i in range(10):
+                await db_audit_logger.log_tool_execution(
+                    tool_name="nmap",
+                    command=f"nmap -sV 192.168.1.{100 + i}",
+                    target=f"192.168.1.{100 + i}",
+                    status="success"
+                )
+            
+            # Logging only enqueues; the single flusher task owns all DB writes
+            assert commit_spy.call_count == 0
+            assert db_audit_logger.get_stats()["pending_db_rows"] == 10
+            
+            # 10 events / batch size 4 -> three commits
+            await db_audit_logger.flush()
+            assert commit_spy.call_count == 3
+            assert db_audit_logger.get_stats()["pending_db_rows"] == 0
+        
+        rows = (await db_session.scalars(select(SecurityAuditLog))).all()
+        assert len(rows) == 10
+        assert all(row.event_type == AuditEventType.TOOL_EXECUTION.value for row in rows)
+        assert {row.previous_hash for row in rows} - {None} <= {row.hash_chain for row in rows}
+
+    async def test_critical_events_flush_immediately(self, db_audit_logger, db_session):
+        """Test that critical events are persisted without waiting for a full batch"""
+        
+        await db_audit_logger.log_emergency_stop(
+            reason="unauthorized_activity_detected",
+            stopped_by="security_lead_1"
+        )
+        
+        assert db_audit_logger.get_stats()["pending_db_rows"] == 0
+        rows = (await db_session.scalars(select(SecurityAuditLog))).all()
+        assert [row.event_type for row in rows] == [AuditEventType.EMERGENCY_STOP.value]
+        assert rows[0].severity == "critical"
+
+    async def test_large_batches_fall_back_from_multi_values_insert(self, db_session, audit_session_factory):
+        """Test that batches above the multi-VALUES limit are still written in one commit"""
+        
+        audit_logger = SecurityAuditLogger(
+            session_id="db_backend_session",
+            backend="database",
+            session_factory=audit_session_factory,
+            flush_threshold=MULTI_VALUES_MAX_ROWS + 50
+        )
+        with _spy_commits() as commit_spy:
+            for i in range(MULTI_VALUES_MAX_ROWS + 20):
+                await audit_logger.log_tool_execution(
+                    tool_name="nmap",
+                    command=f"nmap -sV 10.0.{i // 256}.{i % 256}",
+                    target=f"10.0.{i // 256}.{i % 256}",
+                    status="success"
+                )
+            await audit_logger.close()
+            assert commit_spy.call_count == 1
+        
+        rows = (await db_session.scalars(select(SecurityAuditLog))).all()
+        assert len(rows) == MULTI_VALUES_MAX_ROWS + 20
+        
+        # The Postgres UNNEST statement must bind exactly the row mapping keys
+        row = SecurityAuditLogger._event_to_row(AuditEvent(
+            event_id="evt_unnest",
+            event_type=AuditEventType.TOOL_EXECUTION,
+            timestamp=datetime.now(timezone.utc),
+            session_id="db_backend_session"
+        ))
+        assert [name for name, _ in _UNNEST_COLUMNS] == list(row)
+
+    async def test_failed_flush_leaves_caller_session_untouched(self, db_session, audit_session_factory):
+        """Test that flushes neither roll back nor commit the caller's pending work"""
+        
+        audit_logger = SecurityAuditLogger(
+            session_id="db_backend_session",
+            backend="database",
+            session_factory=audit_session_factory,
+            flush_threshold=4
+        )
+        caller_work = Session(id="caller_pending_session", title="Request handler work")
+        db_session.add(caller_work)
+        
+        # Critical events flush immediately; the failed write is queued for retry
+        with patch.object(audit_logger, "_insert_rows", side_effect=RuntimeError("database unavailable")):
+            await audit_logger.log_emergency_stop(
+                reason="unauthorized_activity_detected",
+                stopped_by="security_lead_1"
+            )
+        assert audit_logger.get_stats()["pending_db_rows"] == 1
+        assert caller_work in db_session.new
+        
+        # The retry commits only the audit rows, never the caller's half-built transaction
+        await audit_logger.close()
+        assert audit_logger.get_stats()["pending_db_rows"] == 0
+        assert caller_work in db_session.new
+        async with audit_session_factory() as other:
+            assert await other.get(Session, "caller_pending_session") is None
+            rows = (await other.scalars(select(SecurityAuditLog))).all()
+            assert [row.event_type for row in rows] == [AuditEventType.EMERGENCY_STOP.value]
+
+    async def test_failed_rollback_keeps_rows_and_flusher_alive(self, db_session, audit_session_factory):
+        """Test that a flush whose rollback also fails keeps its rows and a working flusher"""
+        
+        audit_logger = SecurityAuditLogger(
+            session_id="db_backend_session",
+            backend="database",
+            session_factory=audit_session_factory,
+            flush_threshold=4
+        )
+        with patch.object(audit_logger, "_insert_rows", side_effect=RuntimeError("connection dropped")), \
+                patch.object(AsyncSession, "rollback", side_effect=RuntimeError("connection dropped")):
+            for i in range(3):
+                await audit_logger.log_tool_execution(
+                    tool_name="nmap",
+                    command=f"nmap -sV 192.168.1.{100 + i}",
+                    target=f"192.168.1.{100 + i}",
+                    status="success"
+                )
+            async with asyncio.timeout(5):
+                await audit_logger.flush()
+            assert audit_logger.get_stats()["pending_db_rows"] == 3
+        
+        async with asyncio.timeout(5):
+            await audit_logger.close()
+        assert audit_logger.get_stats()["pending_db_rows"] == 0
+        rows = (await db_session.scalars(select(SecurityAuditLog))).all()
+        assert len(rows) == 3
+
+    async def test_retry_buffer_dead_letters_oldest_rows(self, audit_session_factory, tmp_path):
+        """Test that persistently failing rows beyond max_pending_rows move to the dead-letter file"""
+        
+        dead_letter_file = tmp_path / "audit.deadletter.jsonl"
+        audit_logger = SecurityAuditLogger(
+            session_id="db_backend_session",
+            backend="database",
+            session_factory=audit_session_factory,
+            flush_threshold=4,
+            max_pending_rows=2,
+            dead_letter_file=str(dead_letter_file)
+        )
+        with patch.object(audit_logger, "_insert_rows", side_effect=RuntimeError("value too long")):
+            for i in range(5):
+                await audit_logger.log_tool_execution(
+                    tool_name="nmap",
+                    command=f"nmap -sV 192.168.1.{100 + i}",
+                    target=f"192.168.1.{100 + i}",
+                    status="success"
+                )
+            await audit_logger.close()
+        
+        stats = audit_logger.get_stats()
+        assert stats["pending_db_rows"] == 2
+        assert stats["dead_lettered_rows"] == 3
+        dead = [orjson.loads(line) for line in dead_letter_file.read_bytes().splitlines()]
+        assert [row["target"] for row in dead] == [f"192.168.1.{100 + i}" for i in range(3)]
+
+    async def test_bulk_import_replays_archived_events(self, db_session):
+        """Test that archived events are backfilled in chunks with their stored hashes"""
+        
+        events = []
+        for i in range(7):
+            events.append(AuditEvent(
+                event_id=f"evt_archived_{i}",
+                event_type=AuditEventType.TOOL_EXECUTION,
+                timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=i),
+                session_id="db_backend_session",
+                details={"tool_name": "nmap", "target": f"192.168.1.{100 + i}"},
+                previous_hash=events[-1].integrity_hash if events else None
+            ))
+        
+        imported = await SecurityAuditLogger.bulk_import(db_session, iter(events), chunk_size=3)
+        
+        assert imported == 7
+        rows = (await db_session.scalars(
+            select(SecurityAuditLog).order_by(SecurityAuditLog.timestamp)
+        )).all()
+        assert [row.hash_chain for row in rows] == [event.integrity_hash for event in events]
+        assert rows[3].context == {"tool_name": "nmap", "target": "192.168.1.103"}
+
+    async def test_audit_logs_are_streamed_in_timestamp_order(self, db_audit_logger):
+        """Test that session and critical retrieval stream rows from the database"""
+        
+        for i in range(5):
+            await db_audit_logger.log_tool_execution(
+                tool_name="nmap",
+                command=f"nmap -sV 192.168.1.{100 + i}",
+                target=f"192.168.1.{100 + i}",
+                status="success"
+            )
+        await db_audit_logger.log_emergency_stop(
+            reason="unauthorized_activity_detected",
+            stopped_by="security_lead_1"
+        )
+        
+        session_logs = [
+            log async for log in db_audit_logger.get_session_audit_logs(yield_per=2)
+        ]
+        assert len(session_logs) == 6
+        assert [log.timestamp for log in session_logs] == sorted(log.timestamp for log in session_logs)
+        
+        critical_logs = [
+            log async for log in db_audit_logger.get_critical_audit_logs(
+                start_time=datetime.now(timezone.utc) - timedelta(hours=1)
+            )
+        ]
+        assert [log.event_type for log in critical_logs] == [AuditEventType.EMERGENCY_STOP]
+
+    async def test_flushed_batches_are_sealed_by_merkle_roots(self, db_session, audit_session_factory, tmp_path):
+        """Test that each event verifies against its batch root via an inclusion proof"""
+        
+        audit_logger = SecurityAuditLogger(
+            session_id="db_backend_session",
+            backend="both",
+            log_file=str(tmp_path / "audit.jsonl"),
+            session_factory=audit_session_factory,
+            flush_threshold=4
+        )
+        for i in range(10):
+            await audit_logger.log_tool_execution(
+                tool_name="nmap",
+                command=f"nmap -sV 192.168.1.{100 + i}",
+                target=f"192.168.1.{100 + i}",
+                status="success"
+            )
+        await audit_logger.close()
+        
+        roots = (await db_session.scalars(
+            select(AuditBatchRoot).order_by(AuditBatchRoot.batch_index)
+        )).all()
+        assert [root.leaf_count for root in roots] == [4, 4, 2]
+        
+        stored_roots = {root.batch_index: root.merkle_root for root in roots}
+        for event in await audit_logger.search_events():
+            proof = audit_logger.get_inclusion_proof(event.event_id)
+            assert proof["merkle_root"] == stored_roots[proof["batch_index"]]
+            assert len(proof["audit_path"]) <= 2
+            assert SecurityAuditLogger.verify_inclusion_proof(event, proof)
+        
+        # A tampered event no longer matches the sealed root
+        event.details["status"] = "failed"
+        event.integrity_hash = event._calculate_hash()
+        assert not SecurityAuditLogger.verify_inclusion_proof(event, proof)
+
+    async def test_archived_details_are_loaded_from_parquet(self, audit_session_factory, tmp_path):
+        """Test that archived rows keep only slim columns in the database"""
+
+        audit_logger = SecurityAuditLogger(
+            session_id="db_backend_session",
+            backend="database",
+            session_factory=audit_session_factory,
+            archival_sink=ParquetArchivalSink(str(tmp_path / "archive"))
+        )
+        for i in range(3):
+            await audit_logger.log_tool_execution(
+                tool_name="nmap",
+                command=f"nmap -sV 192.168.1.{100 + i}",
+                target=f"192.168.1.{100 + i}",
+                status="success"
+            )
+        await audit_logger.close()
+
+        assert list((tmp_path / "archive").glob("year=*/month=*/day=*/event_type=tool_execution/*.parquet"))
+
+        rows = [row async for row in audit_logger.get_session_audit_logs()]
+        assert len(rows) == 3
+        assert all(row.context is None and row.hash_chain for row in rows)
+
+        details = await audit_logger.get_event_details(rows[1])
+        assert details["context"]["command"] == "nmap -sV 192.168.1.101"
+
+
+    async def test_archive_reads_span_batches_with_all_null_columns(self, audit_session_factory, tmp_path):
+        """Test that flushes whose optional columns are all None still read back alongside typed ones"""
+
+        audit_logger = SecurityAuditLogger(
+            session_id="db_backend_session",
+            backend="database",
+            session_factory=audit_session_factory,
+            archival_sink=ParquetArchivalSink(str(tmp_path / "archive"))
+        )
+        # Alternate batches with no action/target/result fields and batches that set them
+        for i in range(4):
+            details = {"step": i} if i % 2 == 0 else {
+                "action_id": f"action_{i}",
+                "target": f"192.168.1.{100 + i}",
+                "result": {"open_ports": [22, 80]},
+            }
+            await audit_logger.log_session_event(AuditEventType.TOOL_EXECUTION, details)
+            await audit_logger.flush()
+        await audit_logger.close()
+
+        # Every flush writes the same file schema, whatever values the batch happened to hold
+        schemas = [pq.read_schema(path) for path in (tmp_path / "archive").rglob("*.parquet")]
+        assert len(schemas) == 4
+        assert all(schema.equals(schemas[0]) for schema in schemas)
+
+        rows = [row async for row in audit_logger.get_session_audit_logs()]
+        assert await audit_logger.get_event_details(rows[0]) == {"context": {"step": 0}, "result": None}
+        details = await audit_logger.get_event_details(rows[1])
+        assert details["context"]["target"] == "192.168.1.101"
+        assert details["result"] == {"open_ports": [22, 80]}
+
+    async def test_database_retries_do_not_rewrite_the_archive(self, audit_session_factory, tmp_path):
+        """Test that rows already archived are not archived again while their DB insert is retried"""
+
+        audit_logger = SecurityAuditLogger(
+            session_id="db_backend_session",
+            backend="database",
+            session_factory=audit_session_factory,
+            archival_sink=ParquetArchivalSink(str(tmp_path / "archive"))
+        )
+        with patch.object(audit_logger, "_insert_rows", side_effect=RuntimeError("database unavailable")):
+            for i in range(3):
+                await audit_logger.log_tool_execution(
+                    tool_name="nmap",
+                    command=f"nmap -sV 192.168.1.{100 + i}",
+                    target=f"192.168.1.{100 + i}",
+                    status="success"
+                )
+                await audit_logger.flush()
+        assert audit_logger.get_stats()["pending_db_rows"] == 3
+        await audit_logger.close()
+        assert audit_logger.get_stats()["pending_db_rows"] == 0
+
+        archived_ids = [
+            event_id
+            for path in (tmp_path / "archive").rglob("*.parquet")
+            for event_id in pq.read_table(path, columns=["id"]).column("id").to_pylist()
+        ]
+        rows = [row async for row in audit_logger.get_session_audit_logs()]
+        assert sorted(archived_ids) == sorted(row.id for row in rows)
+        assert all(row.context is None for row in rows)
+
+class TestAuditEventHashing:
+    """Hash algorithm selection for the audit hash chain"""
+
+    def _make_event(self, **overrides):
+        fields = dict(
+            event_id="evt_hash_test",
+            event_type=AuditEventType.TOOL_EXECUTION,
+            timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            session_id="hash_test_session",
+            details={"tool_name": "nmap", "status": "success"},
+            previous_hash="0" * 64,
+        )
+        fields.update(overrides)
+        return AuditEvent(**fields)
+
+    def test_legacy_sha256_events_still_verify(self):
+        """Test that events without a recorded algorithm verify as sha256"""
+        
+        event = self._make_event()
+        data = event.to_dict()
+        del data["hash_algorithm"]
+        data["event_type"] = AuditEventType(data["event_type"])
+        data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+        
+        restored = AuditEvent(**data)
+        assert restored.hash_algorithm == "sha256"
+        assert restored.verify_integrity()
+
+    def test_blake3_events_bind_algorithm_into_hash(self):
+        """Test that blake3 hashes differ from sha256 and resist downgrade"""
+        pytest.importorskip("blake3")
+        
+        event = self._make_event(hash_algorithm="blake3")
+        assert event.verify_integrity()
+        assert event.integrity_hash != self._make_event().integrity_hash
+        
+        event.hash_algorithm = "sha256"
+        assert not event.verify_integrity()
+
+    async def test_file_backend_round_trip_preserves_hashes(self, tmp_path):
+        """Test that events written as JSON lines re-verify after reading back"""
+        
+        file_logger = SecurityAuditLogger(
+            session_id="hash_test_session",
+            backend="file",
+            log_file=str(tmp_path / "audit.jsonl")
+        )
+        for port in (22, 80, 443):
+            await file_logger.log_tool_execution(
+                tool_name="nmap",
+                command=f"nmap -p {port} 192.168.1.100",
+                target="192.168.1.100",
+                status="success"
+            )
+        
+        events = await file_logger.search_events()
+        assert len(events) == 3
+        assert all(event.verify_integrity() for event in events)
+        assert events[-1].integrity_hash == file_logger.get_stats()["last_hash"]
+        assert await file_logger.verify_chain_integrity()
+
+    async def test_old_sealed_batches_are_evicted(self, tmp_path):
+        """Test that only the newest sealed batches keep leaves and proofs in memory"""
+        
+        file_logger = SecurityAuditLogger(
+            session_id="hash_test_session",
+            backend="file",
+            log_file=str(tmp_path / "audit.jsonl"),
+            flush_threshold=2,
+            max_sealed_batches=2
+        )
+        for port in range(8):
+            await file_logger.log_tool_execution(
+                tool_name="nmap",
+                command=f"nmap -p {port} 192.168.1.100",
+                target="192.168.1.100",
+                status="success"
+            )
+        
+        events = await file_logger.search_events()
+        assert file_logger.get_stats()["sealed_batches"] == 4
+        assert sorted(file_logger._sealed_batches) == [2, 3]
+        assert len(file_logger._leaf_index) == 4
+        assert all(file_logger.get_inclusion_proof(event.event_id) is None for event in events[:4])
+        for event in events[4:]:
+            proof = file_logger.get_inclusion_proof(event.event_id)
+            assert SecurityAuditLogger.verify_inclusion_proof(event, proof)
+
+    def test_bulk_chain_verification_reports_first_break(self):
+        """Test that the sequential link check returns the first broken index"""
+        
+        events = [self._make_event(event_id="evt_0", previous_hash=None)]
+        for i in range(1, 6):
+            events.append(self._make_event(
+                event_id=f"evt_{i}",
+                previous_hash=events[-1].integrity_hash
+            ))
+        assert SecurityAuditLogger.verify_chain_bulk(events) == -1
+        
+        events[3] = self._make_event(event_id="evt_3", previous_hash="f" * 64)
+        assert SecurityAuditLogger.verify_chain_bulk(events) == 3
+        
+        events[2] = self._make_event(event_id="evt_2", previous_hash=None)
+        assert SecurityAuditLogger.verify_chain_bulk(events) == 2
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
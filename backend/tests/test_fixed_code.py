@@ -10,35 +10,40 @@ Tests for code that was recently fixed:
 """
 
 import pytest
+import ast
 import asyncio
+import importlib.util
 import json
+import os
+import time
+import msgpack
+import orjson
 from datetime import datetime, timezone
+from pathlib import Path
 from unittest.mock import Mock, AsyncMock, MagicMock, patch
 import uuid
 
+from app.agents.shared.a2a_client.mock_client import InMemoryA2AClient
+from app.agents.shared.registry.agent_registry import load_agent_data
+from app.agents.shared.utils.llm_initialization import (
+    initialize_llm_sync,
+    initialize_llm_async,
+    ensure_llm_instance,
+    get_llm_info
+)
+
 
 class TestOrchestrationFixes:
     """Tests for orchestration.py fixes"""
 
-    @pytest.mark.asyncio
-    async def test_ensure_agents_registered_all_registered(self):
+    async def test_ensure_agents_registered_all_registered(self, prebuilt_client):
         """Test _ensure_agents_registered when all agents are already registered"""
-        from app.agents.shared.a2a_client.mock_client import InMemoryA2AClient
-
-        client = InMemoryA2AClient()
-        # Register all required agents
-        client.register("requirement-analyzer", Mock())
-        client.register("architect", Mock())
-        client.register("stack_recommender", Mock())
-        client.register("documenter", Mock())
-
         # Should not raise and should skip DB checks
-        assert client.is_registered("requirement-analyzer")
-        assert client.is_registered("architect")
-        assert client.is_registered("stack_recommender")
-        assert client.is_registered("documenter")
+        assert prebuilt_client.is_registered("requirement-analyzer")
+        assert prebuilt_client.is_registered("architect")
+        assert prebuilt_client.is_registered("stack_recommender")
+        assert prebuilt_client.is_registered("documenter")
 
-    @pytest.mark.asyncio
     async def test_save_orchestration_results_structure(self):
         """Test _save_orchestration_results handles various result types"""
         # This tests the structure of result handling
@@ -82,13 +87,13 @@ class TestAgentRegistryFixes:
         }
 
         # Serialize to JSON
-        json_str = json.dumps(agent_data)
+        json_bytes = orjson.dumps(agent_data)
 
         # Should be valid JSON
-        assert isinstance(json_str, str)
+        assert isinstance(json_bytes, bytes)
 
         # Should be deserializable
-        parsed = json.loads(json_str)
+        parsed = orjson.loads(json_bytes)
         assert parsed["agent_id"] == "test-agent"
         assert parsed["capabilities"] == ["capability1", "capability2"]
 
@@ -96,7 +101,7 @@ class TestAgentRegistryFixes:
         """Test parsing JSON formatted agent data"""
         json_data = '{"agent_id": "test", "agent_name": "Test", "capabilities": ["a", "b"]}'
 
-        parsed = json.loads(json_data)
+        parsed = orjson.loads(json_data)
 
         assert parsed["agent_id"] == "test"
         assert parsed["agent_name"] == "Test"
@@ -106,84 +111,87 @@ class TestAgentRegistryFixes:
         """Test parsing bytes data (as returned from Redis)"""
         json_data = b'{"agent_id": "test", "agent_name": "Test"}'
 
-        # Decode bytes to string
-        decoded = json_data.decode('utf-8')
-        parsed = json.loads(decoded)
+        # orjson parses bytes directly, no decode step
+        parsed = orjson.loads(json_data)
 
         assert parsed["agent_id"] == "test"
 
     def test_legacy_dict_string_parsing(self):
         """Test parsing legacy Python dict string format"""
-        import ast
-
         # Legacy format: Python dict as string
         legacy_data = "{'agent_id': 'test', 'agent_name': 'Test'}"
 
         # Should fail JSON parsing
-        with pytest.raises(json.JSONDecodeError):
-            json.loads(legacy_data)
-
-        # Should succeed with ast.literal_eval
-        parsed = ast.literal_eval(legacy_data)
-        assert parsed["agent_id"] == "test"
-
-
-class TestMockClientFixes:
-    """Tests for mock_client.py is_registered method"""
+        with pytest.raises(orjson.JSONDecodeError):
+            orjson.loads(legacy_data)
 
-    def test_is_registered_true(self):
-        """Test is_registered returns True for registered agents"""
-        from app.agents.shared.a2a_client.mock_client import InMemoryA2AClient
+        # Should succeed via the JSON rewrite, without ast.literal_eval
+        with patch("ast.literal_eval", side_effect=AssertionError("ast fallback used")):
+            parsed = load_agent_data(legacy_data)
+        assert parsed == {"agent_id": "test", "agent_name": "Test"}
 
-        client = InMemoryA2AClient()
-        client.register("test-agent", Mock())
-
-        assert client.is_registered("test-agent") is True
+        # Literals are rewritten outside strings only; escaped strings still use ast
+        assert load_agent_data(b"{'status': 'None', 'active': True, 'owner': None}") == {
+            "status": "None", "active": True, "owner": None
+        }
+        assert load_agent_data("{'agent_name': 'Tester\\'s agent'}") == {"agent_name": "Tester's agent"}
 
-    def test_is_registered_false(self):
-        """Test is_registered returns False for unregistered agents"""
-        from app.agents.shared.a2a_client.mock_client import InMemoryA2AClient
+    def test_large_legacy_payload_skips_literal_eval(self):
+        """Test that a large JSON-compatible legacy payload never reaches ast.literal_eval"""
+        legacy_data = repr({
+            "agent_id": "test-agent",
+            "capabilities": [f"capability-{i}" for i in range(300)],
+            "metadata": {"active": True, "owner": None},
+        }).encode()
+        assert len(legacy_data) >= 4096
 
-        client = InMemoryA2AClient()
+        with patch("ast.literal_eval", side_effect=AssertionError("ast fallback used")) as literal_eval:
+            parsed = load_agent_data(legacy_data)
 
-        assert client.is_registered("non-existent") is False
+        literal_eval.assert_not_called()
+        assert parsed == ast.literal_eval(legacy_data.decode())
 
-    def test_get_registered_agents(self):
-        """Test get_registered_agents returns all agent names"""
-        from app.agents.shared.a2a_client.mock_client import InMemoryA2AClient
+    @pytest.mark.slow
+    def test_legacy_fast_path_outpaces_literal_eval(self):
+        """Benchmark: the legacy JSON rewrite is at least 5x faster than ast.literal_eval (run with -m slow -n0)"""
+        legacy_data = repr({
+            "agent_id": "test-agent",
+            "capabilities": [f"capability-{i}" for i in range(300)],
+            "metadata": {"active": True, "owner": None},
+        }).encode()
 
-        client = InMemoryA2AClient()
-        client.register("agent-1", Mock())
-        client.register("agent-2", Mock())
-        client.register("agent-3", Mock())
+        def best_of(fn, rounds=30):
+            timings = []
+            for _ in range(rounds):
+                start = time.perf_counter_ns()
+                fn()
+                timings.append(time.perf_counter_ns() - start)
+            return min(timings)
 
-        agents = client.get_registered_agents()
+        fast = best_of(lambda: load_agent_data(legacy_data))
+        slow = best_of(lambda: ast.literal_eval(legacy_data.decode()))
+        assert slow >= 5 * fast
 
-        assert len(agents) == 3
-        assert "agent-1" in agents
-        assert "agent-2" in agents
-        assert "agent-3" in agents
 
-    def test_register_and_check(self):
-        """Test register then check pattern"""
-        from app.agents.shared.a2a_client.mock_client import InMemoryA2AClient
+class TestMockClientFixes:
+    """Tests for mock_client.py is_registered method"""
 
+    @pytest.mark.parametrize("registered,queries,expected", [
+        (["test-agent"], ["test-agent"], [True]),
+        ([], ["non-existent"], [False]),
+        (["agent-1", "agent-2", "agent-3"], ["agent-1", "agent-2", "agent-3", "agent-4"], [True, True, True, False]),
+    ])
+    def test_registration_matrix(self, registered, queries, expected):
+        """Test is_registered/get_registered_agents after registering agents"""
         client = InMemoryA2AClient()
+        for name in registered:
+            client.register(name, Mock(spec=[]))
 
-        # Initially not registered
-        assert client.is_registered("new-agent") is False
-
-        # Register
-        client.register("new-agent", Mock())
+        assert [client.is_registered(name) for name in queries] == expected
+        assert client.get_registered_agents() == registered
 
-        # Now registered
-        assert client.is_registered("new-agent") is True
-
-    @pytest.mark.asyncio
     async def test_create_task_registered_agent(self):
         """Test creating task for registered agent"""
-        from app.agents.shared.a2a_client.mock_client import InMemoryA2AClient
-
         client = InMemoryA2AClient()
 
         # Create mock agent with handle_task method
@@ -201,11 +209,8 @@ class TestMockClientFixes:
         assert task is not None
         assert task.task_type == "test_task"
 
-    @pytest.mark.asyncio
     async def test_create_task_unregistered_agent_raises(self):
         """Test creating task for unregistered agent raises error"""
-        from app.agents.shared.a2a_client.mock_client import InMemoryA2AClient
-
         client = InMemoryA2AClient()
 
         with pytest.raises(RuntimeError) as exc_info:
@@ -221,41 +226,21 @@ class TestMockClientFixes:
 class TestDependenciesFixes:
     """Tests for dependencies.py asyncio compatibility"""
 
-    def test_asyncio_run_compatibility(self):
-        """Test that asyncio.run works in non-async context"""
+    def test_running_loop_detection(self):
+        """Test the sync/async loop detection pattern used in dependencies.py"""
         async def sample_coroutine():
-            return "result"
-
-        # Should work without deprecation warning in Python 3.10+
-        result = asyncio.run(sample_coroutine())
-        assert result == "result"
+            # get_running_loop works in async context
+            return asyncio.get_running_loop()
 
-    def test_get_running_loop_raises_in_sync(self):
-        """Test that get_running_loop raises RuntimeError in sync context"""
+        # No running loop in sync context, so dependencies.py falls back to a new loop
         with pytest.raises(RuntimeError):
             asyncio.get_running_loop()
 
-    @pytest.mark.asyncio
-    async def test_get_running_loop_works_in_async(self):
-        """Test that get_running_loop works in async context"""
-        loop = asyncio.get_running_loop()
-        assert loop is not None
-
-    def test_event_loop_pattern(self):
-        """Test the recommended event loop pattern"""
-        async def async_operation():
-            return "done"
-
-        # Pattern used in dependencies.py
+        loop = asyncio.new_event_loop()
         try:
-            # This should raise in sync context
-            loop = asyncio.get_running_loop()
-            # If we get here, we're in async context (shouldn't happen in this test)
-            assert False, "Should have raised RuntimeError"
-        except RuntimeError:
-            # Expected: no running event loop, safe to use asyncio.run()
-            result = asyncio.run(async_operation())
-            assert result == "done"
+            assert loop.run_until_complete(sample_coroutine()) is loop
+        finally:
+            loop.close()
 
 
 class TestLLMInitializationFixes:
@@ -263,12 +248,7 @@ class TestLLMInitializationFixes:
 
     def test_llm_initialization_module_exists(self):
         """Test that the shared LLM module can be imported"""
-        from app.agents.shared.utils.llm_initialization import (
-            initialize_llm_sync,
-            initialize_llm_async,
-            ensure_llm_instance,
-            get_llm_info
-        )
+        assert importlib.util.find_spec("app.agents.shared.utils.llm_initialization") is not None
 
         # All functions should be importable
         assert callable(initialize_llm_sync)
@@ -278,8 +258,6 @@ class TestLLMInitializationFixes:
 
     def test_get_llm_info_structure(self):
         """Test get_llm_info returns expected structure"""
-        from app.agents.shared.utils.llm_initialization import get_llm_info
-
         # Create mock LLM
         mock_llm = Mock()
         mock_llm.model_name = "gpt-4"
@@ -293,13 +271,12 @@ class TestLLMInitializationFixes:
         assert info["temperature"] == 0.1
 
 
+@pytest.mark.smoke
 class TestDockerfilefix:
     """Tests to verify Dockerfile configurations"""
 
     def test_dockerfile_syntax_validation(self):
         """Test that Dockerfile has correct structure"""
-        import os
-
         # Check main Dockerfile exists
         main_dockerfile = os.path.join(
             os.path.dirname(__file__),
@@ -316,19 +293,19 @@ class TestDockerfilefix:
             "Dockerfile"
         )
 
-        # Files should exist (may fail in CI without full repo)
-        # This is more of a smoke test
-        pass  # Actual validation would require docker build
+        # Skip rather than pass when run outside the full repo checkout;
+        # actual validation would require docker build
+        for path in (main_dockerfile, sandbox_dockerfile):
+            if not os.path.exists(path):
+                pytest.skip(f"{path} missing")
+            assert Path(path).stat().st_size > 0
 
 
 class TestIntegrationScenarios:
     """Integration-style tests for fixed components working together"""
 
-    @pytest.mark.asyncio
     async def test_agent_registration_flow(self):
         """Test complete agent registration and task creation flow"""
-        from app.agents.shared.a2a_client.mock_client import InMemoryA2AClient
-
         client = InMemoryA2AClient()
 
         # 1. Check agents not registered
@@ -368,11 +345,58 @@ class TestIntegrationScenarios:
         }
 
         # Serialize
-        json_str = json.dumps(original)
+        json_bytes = orjson.dumps(original)
 
         # Deserialize
-        restored = json.loads(json_str)
+        restored = orjson.loads(json_bytes)
 
         # Should be equal
         assert restored == original
         assert restored["metadata"]["nested"]["key"] == "value"
+
+    def test_msgpack_roundtrip(self):
+        """Test MessagePack serialization roundtrip for agent data"""
+        original = {
+            "agent_id": "test-agent",
+            "agent_name": "Test Agent",
+            "capabilities": ["cap1", "cap2"],
+            "metadata": {"nested": {"key": "value"}}
+        }
+
+        raw = msgpack.packb(original, use_bin_type=True)
+        restored = msgpack.unpackb(raw, raw=False)
+
+        assert isinstance(raw, bytes)
+        assert restored == original
+
+    @pytest.mark.slow
+    def test_serialization_format_benchmark(self):
+        """Compare agent metadata roundtrip cost across registry formats
+
+        MessagePack is a binary format that encodes and decodes Redis-sized
+        payloads several times faster than stdlib json. This test fails if a
+        candidate registry format loses that edge; run it with -m slow -n0.
+        """
+        metadata = {
+            f"key_{i}": f"value-{i}" if i % 3 else [i, i * 0.5, {"nested": i}]
+            for i in range(200)
+        }
+        codecs = {
+            "json": (json.dumps, json.loads),
+            "orjson": (orjson.dumps, orjson.loads),
+            "msgpack": (
+                lambda obj: msgpack.packb(obj, use_bin_type=True),
+                lambda raw: msgpack.unpackb(raw, raw=False)
+            ),
+        }
+
+        timings = {}
+        for name, (dumps, loads) in codecs.items():
+            assert loads(dumps(metadata)) == metadata
+            start = time.perf_counter()
+            for _ in range(1000):
+                loads(dumps(metadata))
+            timings[name] = time.perf_counter() - start
+
+        assert timings["msgpack"] < timings["json"]
+        assert timings["orjson"] < timings["json"]
@@ -14,307 +14,372 @@ This test validates the complete Nmap scanning workflow including:
 
 import pytest
 import asyncio
-import tempfile
 import json
+import textwrap
+import tracemalloc
 from datetime import datetime, timezone
-from pathlib import Path
 from unittest.mock import Mock, AsyncMock, patch
 
 from app.tools.network import NmapTool
-from app.security.scope_enforcer import ScopeEnforcementEngine
-from app.security.audit_logger import SecurityAuditLogger, AuditEventType
 from app.security.models import SecurityAction, generate_action_id, PentestPhase
 from app.models.models import Session, SecurityAuditLog
 
 
+# Sample scans as nmap writes them; encoded once so tests reuse the bytes
+_SAMPLE_XML_STR = textwrap.dedent("""\
+    <?xml version="1.0" encoding="UTF-8"?>
+    <nmaprun scanner="nmap" args="nmap -sV -O 192.168.1.100" start="1701685200" version="7.94">
+        <host>
+            <status state="up" reason="echo-reply"/>
+            <address addr="192.168.1.100" addrtype="ipv4"/>
+            <hostnames>
+                <hostname name="test-server.local" type="PTR"/>
+            </hostnames>
+            <ports>
+                <port protocol="tcp" portid="22">
+                    <state state="open" reason="syn-ack"/>
+                    <service name="ssh" product="OpenSSH" version="8.2p1" extrainfo="Ubuntu-4ubuntu0.3"/>
+                </port>
+                <port protocol="tcp" portid="80">
+                    <state state="open" reason="syn-ack"/>
+                    <service name="http" product="Apache httpd" version="2.4.41"/>
+                </port>
+                <port protocol="tcp" portid="443">
+                    <state state="open" reason="syn-ack"/>
+                    <service name="https" product="Apache httpd" version="2.4.41" tunnel="ssl"/>
+                </port>
+            </ports>
+            <os>
+                <osmatch name="Linux 5.0 - 5.4" accuracy="95" line="60793"/>
+            </os>
+        </host>
+    </nmaprun>
+""").strip()
+_SAMPLE_XML: bytes = _SAMPLE_XML_STR.encode("utf-8")
+
+_EDGE_XML_STR = textwrap.dedent("""\
+    <?xml version="1.0" encoding="UTF-8"?>
+    <nmaprun scanner="nmap" args="nmap -sV 192.168.1.1" start="1701685200" version="7.94">
+        <host>
+            <status state="up" reason="echo-reply"/>
+            <address addr="192.168.1.1" addrtype="ipv4"/>
+            <ports>
+                <port protocol="tcp" portid="8080">
+                    <state state="filtered" reason="no-response"/>
+                    <service name="http-proxy" method="probed" conf="3"/>
+                </port>
+                <port protocol="udp" portid="53">
+                    <state state="open|filtered" reason="no-response"/>
+                    <service name="domain" method="probed" conf="3"/>
+                </port>
+            </ports>
+        </host>
+        <host>
+            <status state="down" reason="no-response"/>
+            <address addr="192.168.1.2" addrtype="ipv4"/>
+        </host>
+    </nmaprun>
+""").strip()
+_EDGE_XML: bytes = _EDGE_XML_STR.encode("utf-8")
+
+
+def _make_mock_process(returncode: int = 0, stdout: bytes = b"", stderr: bytes = b"") -> Mock:
+    """Stand-in for the process returned by asyncio.create_subprocess_exec"""
+    process = Mock()
+    process.returncode = returncode
+    process.communicate = AsyncMock(return_value=(stdout, stderr))
+    return process
+
+
+class _StubEnforcer:
+    """Scope enforcer stand-in; NmapTool only calls validate_action"""
+
+    def __init__(self, valid: bool = True, message: str = "Target approved"):
+        self.validate_action = AsyncMock(return_value=Mock(valid=valid, message=message))
+
+
+class _StubAuditLogger:
+    """Audit logger stand-in exposing only log_event"""
+
+    def __init__(self):
+        self.log_event = AsyncMock()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _patch_nmap_which():
+    """Resolve the nmap binary to /usr/bin/nmap once for the whole module"""
+    mp = pytest.MonkeyPatch()
+    mp.setattr("shutil.which", lambda _: "/usr/bin/nmap")
+    yield mp
+    mp.undo()
+
+
+@pytest.fixture
+def make_mock_process():
+    """Factory for configured subprocess mocks: make_mock_process(returncode, stdout, stderr)"""
+    return _make_mock_process
+
+
+@pytest.fixture(scope="module")
+def nmap_workdir(tmp_path_factory):
+    """Shared scan output directory; each test works in its own subdirectory"""
+    return tmp_path_factory.mktemp("nmap")
+
+
 class TestNmapScanWorkflow:
     """E2E test suite for Nmap scanning workflow"""
 
     @pytest.fixture
-    async def mock_scope_enforcer(self):
+    def mock_scope_enforcer(self):
         """Mock scope enforcement engine"""
-        enforcer = Mock(spec=ScopeEnforcementEngine)
-        enforcer.validate_action = AsyncMock(return_value=Mock(valid=True, message="Target approved"))
-        return enforcer
+        return _StubEnforcer()
 
     @pytest.fixture
-    async def mock_audit_logger(self):
+    def mock_audit_logger(self):
         """Mock audit logger"""
-        logger = Mock(spec=SecurityAuditLogger)
-        logger.log_event = AsyncMock()
-        return logger
+        return _StubAuditLogger()
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def sample_nmap_xml_output(self):
         """Sample Nmap XML output for testing"""
-        return """<?xml version="1.0" encoding="UTF-8"?>
-        <nmaprun scanner="nmap" args="nmap -sV -O 192.168.1.100" start="1701685200" version="7.94">
-            <host>
-                <status state="up" reason="echo-reply"/>
-                <address addr="192.168.1.100" addrtype="ipv4"/>
-                <hostnames>
-                    <hostname name="test-server.local" type="PTR"/>
-                </hostnames>
-                <ports>
-                    <port protocol="tcp" portid="22">
-                        <state state="open" reason="syn-ack"/>
-                        <service name="ssh" product="OpenSSH" version="8.2p1" extrainfo="Ubuntu-4ubuntu0.3"/>
-                    </port>
-                    <port protocol="tcp" portid="80">
-                        <state state="open" reason="syn-ack"/>
-                        <service name="http" product="Apache httpd" version="2.4.41"/>
-                    </port>
-                    <port protocol="tcp" portid="443">
-                        <state state="open" reason="syn-ack"/>
-                        <service name="https" product="Apache httpd" version="2.4.41" tunnel="ssl"/>
-                    </port>
-                </ports>
-                <os>
-                    <osmatch name="Linux 5.0 - 5.4" accuracy="95" line="60793"/>
-                </os>
-            </host>
-        </nmaprun>"""
-
-    @pytest.mark.asyncio
-    async def test_complete_nmap_scan_workflow(self, mock_scope_enforcer, mock_audit_logger, sample_nmap_xml_output):
+        return _SAMPLE_XML_STR
+
+    async def test_complete_nmap_scan_workflow(
+        self, request, nmap_workdir, mock_scope_enforcer, mock_audit_logger, make_mock_process
+    ):
         """Test complete Nmap scan workflow from target validation to finding storage"""
         
         # Setup test environment
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_dir = Path(temp_dir)
-            
-            # Create XML output file
-            xml_file = output_dir / "nmap_scan_results.xml"
-            xml_file.write_text(sample_nmap_xml_output)
-            
-            # Initialize Nmap tool with mocked dependencies
-            with patch('shutil.which', return_value='/usr/bin/nmap'):
-                nmap_tool = NmapTool(
-                    scope_enforcer=mock_scope_enforcer,
-                    tool_path='/usr/bin/nmap',
-                    output_dir=str(output_dir)
+        output_dir = nmap_workdir / request.node.name
+        output_dir.mkdir()
+        
+        # Create XML output file
+        xml_file = output_dir / "nmap_scan_results.xml"
+        xml_file.write_bytes(_SAMPLE_XML)
+        
+        # Initialize Nmap tool with mocked dependencies
+        nmap_tool = NmapTool(
+            scope_enforcer=mock_scope_enforcer,
+            tool_path='/usr/bin/nmap',
+            output_dir=str(output_dir)
+        )
+        
+        # Mock subprocess execution
+        mock_process = make_mock_process(returncode=0, stdout=_SAMPLE_XML)
+        
+        with patch('asyncio.create_subprocess_exec', return_value=mock_process):
+            with patch.object(nmap_tool, '_find_output_files', return_value=[str(xml_file)]):
+                
+                # Execute scan
+                result = await nmap_tool.scan_with_validation(
+                    targets=["192.168.1.100"],
+                    scan_type="service_detection",
+                    ports="22,80,443"
                 )
+        
+        # Verify execution results
+        assert result.success is True
+        assert result.tool_name == "nmap"
+        assert result.exit_code == 0
+        assert len(result.findings) > 0
+        
+        # Verify target discovery
+        assert "192.168.1.100" in result.targets_discovered
+        
+        # Verify service discovery
+        services = result.services_discovered
+        assert len(services) == 3
+        
+        # Check specific services
+        [ssh_service] = result.services_by_port[(22, 'tcp')]
+        assert ssh_service['service'] == 'ssh'
+        assert ssh_service['version'] == 'OpenSSH 8.2p1'
+        
+        [http_service] = result.services_by_port[(80, 'tcp')]
+        assert http_service['service'] == 'http'
+        assert http_service['version'] == 'Apache httpd 2.4.41'
+        
+        # Verify findings structure
+        for finding in result.findings:
+            assert 'type' in finding
+            assert 'host' in finding
+            assert 'timestamp' in finding
             
-            # Mock subprocess execution
-            mock_process = Mock()
-            mock_process.returncode = 0
-            mock_process.communicate = AsyncMock(return_value=(
-                sample_nmap_xml_output.encode(),
-                b""
-            ))
-            
-            with patch('asyncio.create_subprocess_exec', return_value=mock_process):
-                with patch.object(nmap_tool, '_find_output_files', return_value=[str(xml_file)]):
-                    
-                    # Execute scan
-                    result = await nmap_tool.scan_with_validation(
-                        targets=["192.168.1.100"],
-                        scan_type="service_detection",
-                        ports="22,80,443"
-                    )
-            
-            # Verify execution results
-            assert result.success is True
-            assert result.tool_name == "nmap"
-            assert result.exit_code == 0
-            assert len(result.findings) > 0
-            
-            # Verify target discovery
-            assert "192.168.1.100" in result.targets_discovered
-            
-            # Verify service discovery
-            services = result.services_discovered
-            assert len(services) == 3
-            
-            # Check specific services
-            ssh_service = next((s for s in services if s['port'] == 22), None)
-            assert ssh_service is not None
-            assert ssh_service['service'] == 'ssh'
-            assert ssh_service['version'] == 'OpenSSH 8.2p1'
-            
-            http_service = next((s for s in services if s['port'] == 80), None)
-            assert http_service is not None
-            assert http_service['service'] == 'http'
-            assert http_service['version'] == 'Apache httpd 2.4.41'
-            
-            # Verify findings structure
-            for finding in result.findings:
-                assert 'type' in finding
-                assert 'host' in finding
-                assert 'timestamp' in finding
-                
-                if finding['type'] == 'service':
-                    assert 'port' in finding
-                    assert 'protocol' in finding
-                    assert 'service' in finding
-                    assert 'state' in finding
-
-    @pytest.mark.asyncio
-    async def test_nmap_scope_validation_workflow(self, mock_audit_logger):
+            if finding['type'] == 'service':
+                assert 'port' in finding
+                assert 'protocol' in finding
+                assert 'service' in finding
+                assert 'state' in finding
+
+    async def test_nmap_scope_validation_workflow(self, request, nmap_workdir, mock_audit_logger):
         """Test Nmap scope validation workflow"""
         
         # Create scope enforcer that denies access
-        mock_scope_enforcer = Mock(spec=ScopeEnforcementEngine)
-        mock_scope_enforcer.validate_action = AsyncMock(return_value=Mock(
-            valid=False, 
-            message="Target outside approved scope"
-        ))
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('shutil.which', return_value='/usr/bin/nmap'):
-                nmap_tool = NmapTool(
-                    scope_enforcer=mock_scope_enforcer,
-                    output_dir=temp_dir
-                )
-            
-            # Attempt scan of unauthorized target
-            with pytest.raises(Exception) as exc_info:
-                await nmap_tool.scan_with_validation(
-                    targets=["8.8.8.8"]  # Unauthorized external target
-                )
-            
-            # Verify scope validation was called
-            mock_scope_enforcer.validate_action.assert_called_once()
-            
-            # Verify action structure
-            call_args = mock_scope_enforcer.validate_action.call_args[0][0]
-            assert isinstance(call_args, SecurityAction)
-            assert call_args.action_type == "port_scan"
-            assert call_args.target == "8.8.8.8"
-            assert call_args.tool_name == "nmap"
-            assert call_args.phase == PentestPhase.SCANNING
-
-    @pytest.mark.asyncio
-    async def test_nmap_error_handling_workflow(self, mock_scope_enforcer):
+        mock_scope_enforcer = _StubEnforcer(valid=False, message="Target outside approved scope")
+        
+        output_dir = nmap_workdir / request.node.name
+        output_dir.mkdir()
+        nmap_tool = NmapTool(
+            scope_enforcer=mock_scope_enforcer,
+            output_dir=output_dir
+        )
+        
+        # Attempt scan of unauthorized target
+        with pytest.raises(Exception) as exc_info:
+            await nmap_tool.scan_with_validation(
+                targets=["8.8.8.8"]  # Unauthorized external target
+            )
+        
+        # Verify scope validation was called
+        mock_scope_enforcer.validate_action.assert_called_once()
+        
+        # Verify action structure
+        call_args = mock_scope_enforcer.validate_action.call_args[0][0]
+        assert isinstance(call_args, SecurityAction)
+        assert call_args.action_type == "port_scan"
+        assert call_args.target == "8.8.8.8"
+        assert call_args.tool_name == "nmap"
+        assert call_args.phase == PentestPhase.SCANNING
+
+    async def test_nmap_error_handling_workflow(self, request, nmap_workdir, mock_scope_enforcer, make_mock_process):
         """Test Nmap error handling in workflow"""
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('shutil.which', return_value='/usr/bin/nmap'):
-                nmap_tool = NmapTool(
-                    scope_enforcer=mock_scope_enforcer,
-                    output_dir=temp_dir
-                )
-            
-            # Mock failed subprocess execution
-            mock_process = Mock()
-            mock_process.returncode = 1
-            mock_process.communicate = AsyncMock(return_value=(
-                b"",
-                b"nmap: Cannot resolve hostname"
-            ))
-            
-            with patch('asyncio.create_subprocess_exec', return_value=mock_process):
-                result = await nmap_tool.scan_with_validation(
-                    targets=["invalid-hostname.test"]
-                )
-            
-            # Verify error handling
-            assert result.success is False
-            assert result.exit_code == 1
-            assert "Cannot resolve hostname" in result.stderr
-            assert len(result.findings) == 0
-
-    @pytest.mark.asyncio 
-    async def test_nmap_xml_parsing_edge_cases(self, mock_scope_enforcer):
+        output_dir = nmap_workdir / request.node.name
+        output_dir.mkdir()
+        nmap_tool = NmapTool(
+            scope_enforcer=mock_scope_enforcer,
+            output_dir=output_dir
+        )
+        
+        # Mock failed subprocess execution
+        mock_process = make_mock_process(returncode=1, stderr=b"nmap: Cannot resolve hostname")
+        
+        with patch('asyncio.create_subprocess_exec', return_value=mock_process):
+            result = await nmap_tool.scan_with_validation(
+                targets=["invalid-hostname.test"]
+            )
+        
+        # Verify error handling
+        assert result.success is False
+        assert result.exit_code == 1
+        assert "Cannot resolve hostname" in result.stderr
+        assert len(result.findings) == 0
+
+    async def test_nmap_xml_parsing_edge_cases(self, request, nmap_workdir, mock_scope_enforcer, make_mock_process):
         """Test Nmap XML parsing with various edge cases"""
         
-        edge_case_xml = """<?xml version="1.0" encoding="UTF-8"?>
-        <nmaprun scanner="nmap" args="nmap -sV 192.168.1.1" start="1701685200" version="7.94">
-            <host>
-                <status state="up" reason="echo-reply"/>
-                <address addr="192.168.1.1" addrtype="ipv4"/>
-                <ports>
-                    <port protocol="tcp" portid="8080">
-                        <state state="filtered" reason="no-response"/>
-                        <service name="http-proxy" method="probed" conf="3"/>
-                    </port>
-                    <port protocol="udp" portid="53">
-                        <state state="open|filtered" reason="no-response"/>
-                        <service name="domain" method="probed" conf="3"/>
-                    </port>
-                </ports>
-            </host>
-            <host>
-                <status state="down" reason="no-response"/>
-                <address addr="192.168.1.2" addrtype="ipv4"/>
-            </host>
-        </nmaprun>"""
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_dir = Path(temp_dir)
-            xml_file = output_dir / "edge_case_scan.xml"
-            xml_file.write_text(edge_case_xml)
-            
-            with patch('shutil.which', return_value='/usr/bin/nmap'):
-                nmap_tool = NmapTool(
-                    scope_enforcer=mock_scope_enforcer,
-                    output_dir=str(output_dir)
+        output_dir = nmap_workdir / request.node.name
+        output_dir.mkdir()
+        xml_file = output_dir / "edge_case_scan.xml"
+        xml_file.write_bytes(_EDGE_XML)
+        
+        nmap_tool = NmapTool(
+            scope_enforcer=mock_scope_enforcer,
+            output_dir=str(output_dir)
+        )
+        
+        mock_process = make_mock_process(returncode=0, stdout=_EDGE_XML)
+        
+        with patch('asyncio.create_subprocess_exec', return_value=mock_process):
+            with patch.object(nmap_tool, '_find_output_files', return_value=[str(xml_file)]):
+                result = await nmap_tool.scan_with_validation(
+                    targets=["192.168.1.0/29"]
                 )
-            
-            mock_process = Mock()
-            mock_process.returncode = 0
-            mock_process.communicate = AsyncMock(return_value=(
-                edge_case_xml.encode(),
-                b""
-            ))
-            
-            with patch('asyncio.create_subprocess_exec', return_value=mock_process):
-                with patch.object(nmap_tool, '_find_output_files', return_value=[str(xml_file)]):
-                    result = await nmap_tool.scan_with_validation(
-                        targets=["192.168.1.0/29"]
-                    )
-            
-            # Verify parsing handles various port states
-            assert result.success is True
-            assert len(result.findings) > 0
-            
-            # Verify only up hosts are included in targets
-            assert "192.168.1.1" in result.targets_discovered
-            assert "192.168.1.2" not in result.targets_discovered
-            
-            # Verify service parsing handles different states
-            services = result.services_discovered
-            filtered_service = next((s for s in services if s['state'] == 'filtered'), None)
-            assert filtered_service is not None
-            
-            open_filtered_service = next((s for s in services if s['state'] == 'open|filtered'), None)
-            assert open_filtered_service is not None
+        
+        # Verify parsing handles various port states
+        assert result.success is True
+        assert len(result.findings) > 0
+        
+        # Verify only up hosts are included in targets
+        assert "192.168.1.1" in result.targets_discovered
+        assert "192.168.1.2" not in result.targets_discovered
+        
+        # Verify service parsing handles different states
+        assert [s['state'] for s in result.services_by_port[(8080, 'tcp')]] == ['filtered']
+        assert [s['state'] for s in result.services_by_port[(53, 'udp')]] == ['open|filtered']
 
-    @pytest.mark.asyncio
-    async def test_nmap_concurrent_scan_workflow(self, mock_scope_enforcer):
+    async def test_nmap_concurrent_scan_workflow(self, request, nmap_workdir, mock_scope_enforcer, make_mock_process):
         """Test concurrent Nmap scans"""
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('shutil.which', return_value='/usr/bin/nmap'):
-                nmap_tool = NmapTool(
-                    scope_enforcer=mock_scope_enforcer,
-                    output_dir=temp_dir
-                )
-            
-            # Mock successful scans
-            mock_process = Mock()
-            mock_process.returncode = 0
-            mock_process.communicate = AsyncMock(return_value=(
-                b"<nmaprun><host><status state='up'/></host></nmaprun>",
-                b""
-            ))
-            
-            with patch('asyncio.create_subprocess_exec', return_value=mock_process):
-                # Execute concurrent scans
+        output_dir = nmap_workdir / request.node.name
+        output_dir.mkdir()
+        nmap_tool = NmapTool(
+            scope_enforcer=mock_scope_enforcer,
+            output_dir=output_dir
+        )
+        
+        # Mock successful scans
+        mock_process = make_mock_process(returncode=0, stdout=b"<nmaprun><host><status state='up'/></host></nmaprun>")
+        
+        with patch('asyncio.create_subprocess_exec', return_value=mock_process):
+            # Execute concurrent scans (any failure propagates out of the TaskGroup)
+            async with asyncio.TaskGroup() as tg:
                 tasks = [
-                    nmap_tool.scan_with_validation(targets=[f"192.168.1.{i}"])
+                    tg.create_task(nmap_tool.scan_with_validation(targets=[f"192.168.1.{i}"]))
                     for i in range(100, 105)
                 ]
-                
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Verify all scans completed successfully
-            for result in results:
-                assert not isinstance(result, Exception)
-                assert result.success is True
-            
-            # Verify scope validation called for each target
-            assert mock_scope_enforcer.validate_action.call_count == 5
+        results = [task.result() for task in tasks]
+        
+        # Verify all scans completed successfully
+        for result in results:
+            assert result.success is True
+        
+        # Verify scope validation called for each target
+        assert mock_scope_enforcer.validate_action.call_count == 5
+
+
+def test_nmap_xml_streaming_parse_memory(tmp_path):
+    """Test that XML parsing memory does not grow with the number of hosts"""
+    
+    # Parsing never touches the binary, so skip the availability check
+    with patch.object(NmapTool, "_verify_tool_availability", return_value=True):
+        nmap_tool = NmapTool(output_dir=tmp_path)
+    
+    host_xml = (
+        '<host><status state="up" reason="echo-reply"/>'
+        '<address addr="10.0.{0}.{1}" addrtype="ipv4"/><ports>'
+        '<port protocol="tcp" portid="22"><state state="open" reason="syn-ack"/>'
+        '<service name="ssh" product="OpenSSH" version="8.2p1"/></port>'
+        '</ports></host>'
+    )
+    xml_file = tmp_path / "large_scan.xml"
+    xml_file.write_text(
+        '<?xml version="1.0" encoding="UTF-8"?><nmaprun scanner="nmap">'
+        + "".join(host_xml.format(i // 256, i % 256) for i in range(2000))
+        + "</nmaprun>"
+    )
+    
+    tracemalloc.start()
+    try:
+        findings = nmap_tool._parse_xml_output(str(xml_file))
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    assert len(findings) == 2000
+    # Only the findings are retained; per-host parse state is released as it streams
+    assert peak - retained < 256 * 1024
+
+
+def test_services_by_port_keeps_every_host(tmp_path):
+    """Test that services on the same port from different hosts are all indexed"""
+    
+    with patch.object(NmapTool, "_verify_tool_availability", return_value=True):
+        nmap_tool = NmapTool(output_dir=tmp_path)
+    
+    services = [
+        {"host": host, "port": port, "protocol": "tcp", "service": name, "version": None, "state": "open"}
+        for host, port, name in [
+            ("192.168.1.100", 80, "http"),
+            ("192.168.1.101", 80, "http"),
+            ("192.168.1.101", 22, "ssh"),
+        ]
+    ]
+    services_by_port = nmap_tool._index_services(services)
+    
+    assert [s["host"] for s in services_by_port[(80, "tcp")]] == ["192.168.1.100", "192.168.1.101"]
+    assert [s["host"] for s in services_by_port[(22, "tcp")]] == ["192.168.1.101"]
+
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v"])
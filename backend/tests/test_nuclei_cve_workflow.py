@@ -14,27 +14,142 @@ This test validates the complete Nuclei vulnerability scanning workflow includin
 
 import pytest
 import asyncio
-import tempfile
-import json
-from datetime import datetime, timezone
+import contextlib
+import functools
 from pathlib import Path
-from unittest.mock import Mock, AsyncMock, patch
+from types import SimpleNamespace
+from unittest.mock import Mock, AsyncMock, mock_open, patch
+
+import orjson
 
 from app.tools.vulnerability import NucleiTool
 from app.security.scope_enforcer import ScopeEnforcementEngine
 from app.security.models import SecurityAction, SeverityLevel, RiskLevel, generate_finding_id
 from app.security.risk_evaluator import RiskEvaluator
 
+TESTDATA_DIR = Path(__file__).parent / "testdata"
+
+
+@functools.lru_cache(maxsize=None)
+def _load_fixture(name: str) -> str:
+    """Read a static scan output from tests/testdata once per process"""
+    return (TESTDATA_DIR / name).read_text(encoding="utf-8")
+
+
+# Timestamp for hand-built findings; nothing here depends on wall-clock time
+_FIXED_TS = "2024-12-04T10:30:00+00:00"
+
+# Scan outputs and their UTF-8 encodings, built once at import
+_SAMPLE_JSON = _load_fixture("nuclei_sample.json")
+_SAMPLE_BYTES = _SAMPLE_JSON.encode()
+_EDGE_CASE_BYTES = _load_fixture("nuclei_edge_cases.json").encode()
+
+# One finding per severity level, identical apart from the severity-derived fields
+_SEV_TEMPLATE = {
+    "template": None,
+    "template-id": None,
+    "info": {"name": None, "severity": None},
+    "host": "example.com",
+    "matched-at": "https://example.com",
+    "timestamp": _FIXED_TS,
+}
+_MULTI_SEVERITY_BYTES = orjson.dumps([
+    {
+        **_SEV_TEMPLATE,
+        "template": f"{severity}-vuln",
+        "template-id": f"{severity}-1",
+        "info": {"name": f"{severity.capitalize()} Vulnerability", "severity": severity},
+    }
+    for severity in ("critical", "high", "medium", "low")
+])
+
+# Requested template categories; "dos" and "fuzzing" must be filtered out
+_TEMPLATE_INPUT = ("cves", "default-logins", "technologies", "dos", "fuzzing", "misconfigurations")
+_EXPECTED_AUTHORIZED = frozenset({"cves", "default-logins", "technologies", "misconfigurations"})
+
+
+def _async_return(value):
+    """Plain coroutine function returning value; cheaper than AsyncMock when calls aren't asserted"""
+    async def _return(*args, **kwargs):
+        return value
+    return _return
+
+
+def _parse_in_memory(tool: NucleiTool, payload: bytes):
+    """_parse_json_output side effect running the real parser over payload instead of a file"""
+    def _parse(json_file):
+        with patch("app.tools.vulnerability.open", mock_open(read_data=payload), create=True):
+            return NucleiTool._parse_json_output(tool, json_file)
+    return _parse
+
+
+# Attribute names for spec'd enforcer mocks, so each Mock skips re-inspecting the class
+_ENFORCER_SPEC = dir(ScopeEnforcementEngine)
+
+
+class _StubScopeEnforcer:
+    """Scope enforcer stand-in approving every target; NucleiTool only calls validate_action"""
+
+    async def validate_action(self, action):
+        return SimpleNamespace(valid=True, message="Target approved")
+
+
+def _counting_enforcer(**validate_action) -> Mock:
+    """Spec'd enforcer mock whose validate_action records calls (kwargs go to AsyncMock)"""
+    enforcer = Mock(spec=_ENFORCER_SPEC)
+    enforcer.validate_action = AsyncMock(**validate_action)
+    return enforcer
+
+
+def _mk_proc(stdout: bytes = b"[]", rc: int = 0) -> Mock:
+    """Stand-in for the process returned by asyncio.create_subprocess_exec"""
+    process = Mock()
+    process.returncode = rc
+    process.communicate = _async_return((stdout, b""))
+    return process
+
+
+@contextlib.contextmanager
+def fast_nuclei_test_env(tool: NucleiTool, payload: bytes, filename: str = "nuclei_scan.json"):
+    """Patch one NucleiTool scan to emit payload; yields (tool, json_path)
+
+    The subprocess, output-file lookup and JSON parser are all replaced, so a
+    scan touches neither a nuclei binary nor the disk for its results file.
+    """
+    json_path = tool.output_dir / filename  # never written; parsed from memory
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(patch('asyncio.create_subprocess_exec', return_value=_mk_proc(payload)))
+        stack.enter_context(patch.object(tool, '_find_output_files', return_value=[str(json_path)]))
+        stack.enter_context(patch.object(tool, '_parse_json_output', side_effect=_parse_in_memory(tool, payload)))
+        yield tool, json_path
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _patch_nuclei_which():
+    """Resolve the nuclei binary to /usr/bin/nuclei once for the whole module"""
+    mp = pytest.MonkeyPatch()
+    mp.setattr("shutil.which", lambda _: "/usr/bin/nuclei")
+    yield mp
+    mp.undo()
+
+
+@pytest.fixture(scope="session")
+def shared_tmp(tmp_path_factory):
+    """Shared scan output directory; each test works in its own subdirectory
+
+    tmp_path_factory hands every xdist worker its own base directory, so the
+    tests in this module stay independent when sharded with ``-n auto``.
+    """
+    return tmp_path_factory.mktemp("nuclei_tests")
+
 
 class TestNucleiCVEWorkflow:
     """E2E test suite for Nuclei CVE detection workflow"""
 
     @pytest.fixture
     async def mock_scope_enforcer(self):
-        """Mock scope enforcement engine"""
-        enforcer = Mock(spec=ScopeEnforcementEngine)
-        enforcer.validate_action = AsyncMock(return_value=Mock(valid=True, message="Target approved"))
-        return enforcer
+        """Scope enforcer approving every target"""
+        return _StubScopeEnforcer()
 
     @pytest.fixture
     async def mock_risk_evaluator(self):
@@ -44,174 +159,68 @@ class TestNucleiCVEWorkflow:
         return evaluator
 
     @pytest.fixture
+    def nuclei_tool(self, request, shared_tmp, mock_scope_enforcer):
+        """NucleiTool writing into this test's own directory under shared_tmp"""
+        return NucleiTool(
+            scope_enforcer=mock_scope_enforcer,
+            tool_path='/usr/bin/nuclei',
+            output_dir=str(shared_tmp / request.node.name)
+        )
+
+    @pytest.fixture(scope="module")
     def sample_nuclei_json_output(self):
-        """Sample Nuclei JSON output for testing"""
-        return json.dumps([
-            {
-                "template": "CVE-2021-44228-log4j-rce",
-                "template-id": "CVE-2021-44228",
-                "template-path": "/nuclei-templates/cves/2021/CVE-2021-44228.yaml",
-                "info": {
-                    "name": "Apache Log4j RCE",
-                    "author": ["daffainfo"],
-                    "tags": ["cve", "cve2021", "rce", "log4j", "oast"],
-                    "description": "Apache Log4j Remote Code Execution",
-                    "reference": ["https://cve.mitre.org/cgi-bin/cvename.cgi?name=CVE-2021-44228"],
-                    "severity": "critical",
-                    "metadata": {
-                        "verified": True,
-                        "cvss-score": 9.8,
-                        "cvss-vector": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H"
-                    },
-                    "classification": {
-                        "cve-id": "CVE-2021-44228",
-                        "cwe-id": "CWE-917"
-                    }
-                },
-                "type": "http",
-                "host": "https://vulnerable-app.example.com",
-                "matched-at": "https://vulnerable-app.example.com/login",
-                "timestamp": "2024-12-04T10:30:00.000Z",
-                "matcher-status": True,
-                "curl-command": "curl -X GET 'https://vulnerable-app.example.com/login'"
-            },
-            {
-                "template": "CVE-2022-0543-redis-rce",
-                "template-id": "CVE-2022-0543", 
-                "template-path": "/nuclei-templates/cves/2022/CVE-2022-0543.yaml",
-                "info": {
-                    "name": "Redis Lua Sandbox Escape",
-                    "author": ["dwisiswant0"],
-                    "tags": ["cve", "cve2022", "redis", "rce"],
-                    "description": "Redis Lua sandbox escape vulnerability",
-                    "reference": ["https://cve.mitre.org/cgi-bin/cvename.cgi?name=CVE-2022-0543"],
-                    "severity": "high",
-                    "metadata": {
-                        "verified": True,
-                        "cvss-score": 8.1,
-                        "cvss-vector": "CVSS:3.1/AV:N/AC:H/PR:N/UI:N/S:U/C:H/I:H/A:H"
-                    },
-                    "classification": {
-                        "cve-id": "CVE-2022-0543",
-                        "cwe-id": "CWE-94"
-                    }
-                },
-                "type": "network",
-                "host": "192.168.1.100:6379",
-                "matched-at": "192.168.1.100:6379",
-                "timestamp": "2024-12-04T10:31:00.000Z",
-                "matcher-status": True
-            },
-            {
-                "template": "generic-panels-detection",
-                "template-id": "generic-panel",
-                "template-path": "/nuclei-templates/technologies/generic-panel.yaml",
-                "info": {
-                    "name": "Generic Admin Panel Detection",
-                    "author": ["pdteam"],
-                    "tags": ["tech", "panel", "admin"],
-                    "description": "Generic admin panel detection",
-                    "severity": "info"
-                },
-                "type": "http",
-                "host": "https://vulnerable-app.example.com",
-                "matched-at": "https://vulnerable-app.example.com/admin",
-                "timestamp": "2024-12-04T10:32:00.000Z",
-                "matcher-status": True
-            }
-        ])
-
-    @pytest.mark.asyncio
-    async def test_complete_nuclei_cve_workflow(self, mock_scope_enforcer, mock_risk_evaluator, sample_nuclei_json_output):
+        """Sample Nuclei JSON output for testing, as text and pre-encoded bytes"""
+        return SimpleNamespace(text=_SAMPLE_JSON, bytes=_SAMPLE_BYTES)
+
+    async def test_complete_nuclei_cve_workflow(self, nuclei_tool, mock_risk_evaluator, sample_nuclei_json_output):
         """Test complete Nuclei CVE detection workflow"""
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_dir = Path(temp_dir)
-            
-            # Create JSON output file
-            json_file = output_dir / "nuclei_scan_results.json"
-            json_file.write_text(sample_nuclei_json_output)
-            
-            # Initialize Nuclei tool
-            with patch('shutil.which', return_value='/usr/bin/nuclei'):
-                nuclei_tool = NucleiTool(
-                    scope_enforcer=mock_scope_enforcer,
-                    tool_path='/usr/bin/nuclei',
-                    output_dir=str(output_dir)
-                )
-            
-            # Mock subprocess execution
-            mock_process = Mock()
-            mock_process.returncode = 0
-            mock_process.communicate = AsyncMock(return_value=(
-                sample_nuclei_json_output.encode(),
-                b""
-            ))
-            
-            with patch('asyncio.create_subprocess_exec', return_value=mock_process):
-                with patch.object(nuclei_tool, '_find_output_files', return_value=[str(json_file)]):
-                    # Execute vulnerability scan
-                    result = await nuclei_tool.scan_with_validation(
-                        targets=["https://vulnerable-app.example.com", "192.168.1.100"],
-                        template_categories=["cves", "technologies"],
-                        severity_filter=["critical", "high", "medium"]
-                    )
-            
-            # Verify execution results
-            assert result.success is True
-            assert result.tool_name == "nuclei"
-            assert result.exit_code == 0
-            assert len(result.findings) == 3
-            
-            # Verify CVE findings
-            cve_findings = [f for f in result.findings if f.get('cve_id')]
-            assert len(cve_findings) == 2
-            
-            # Verify critical CVE (Log4j)
-            log4j_finding = next((f for f in cve_findings if f.get('cve_id') == 'CVE-2021-44228'), None)
-            assert log4j_finding is not None
-            assert log4j_finding['severity'] == 'critical'
-            assert log4j_finding['cvss_score'] == 9.8
-            assert log4j_finding['cvss_vector'] == 'CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H'
-            assert 'RCE' in log4j_finding['name']
-            
-            # Verify high CVE (Redis)
-            redis_finding = next((f for f in cve_findings if f.get('cve_id') == 'CVE-2022-0543'), None)
-            assert redis_finding is not None
-            assert redis_finding['severity'] == 'high'
-            assert redis_finding['cvss_score'] == 8.1
-            
-            # Verify target discovery
-            assert "vulnerable-app.example.com" in result.targets_discovered
-            assert "192.168.1.100" in result.targets_discovered
+        with fast_nuclei_test_env(nuclei_tool, sample_nuclei_json_output.bytes, "nuclei_scan_results.json") as (tool, _):
+            # Execute vulnerability scan
+            result = await tool.scan_with_validation(
+                targets=["https://vulnerable-app.example.com", "192.168.1.100"],
+                template_categories=["cves", "technologies"],
+                severity_filter=["critical", "high", "medium"]
+            )
+        
+        # Verify execution results
+        assert result.success is True
+        assert result.tool_name == "nuclei"
+        assert result.exit_code == 0
+        assert len(result.findings) == 3
+        
+        # Verify CVE findings
+        cve_findings = [f for f in result.findings if f.get('cve_id')]
+        assert len(cve_findings) == 2
+        by_id = {f['cve_id']: f for f in cve_findings}
+        
+        # Verify critical CVE (Log4j)
+        log4j_finding = by_id.get('CVE-2021-44228')
+        assert log4j_finding is not None
+        assert log4j_finding['severity'] == 'critical'
+        assert log4j_finding['cvss_score'] == 9.8
+        assert log4j_finding['cvss_vector'] == 'CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H'
+        assert 'RCE' in log4j_finding['name']
+        
+        # Verify high CVE (Redis)
+        redis_finding = by_id.get('CVE-2022-0543')
+        assert redis_finding is not None
+        assert redis_finding['severity'] == 'high'
+        assert redis_finding['cvss_score'] == 8.1
+        
+        # Verify target discovery
+        assert "vulnerable-app.example.com" in result.targets_discovered
+        assert "192.168.1.100" in result.targets_discovered
 
-    @pytest.mark.asyncio
-    async def test_nuclei_template_filtering(self, mock_scope_enforcer):
+    async def test_nuclei_template_filtering(self, nuclei_tool):
         """Test Nuclei template filtering and security policy enforcement"""
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('shutil.which', return_value='/usr/bin/nuclei'):
-                nuclei_tool = NucleiTool(
-                    scope_enforcer=mock_scope_enforcer,
-                    output_dir=temp_dir
-                )
-            
-            # Test authorized template filtering
-            authorized_templates = nuclei_tool._filter_authorized_templates([
-                "cves", "default-logins", "technologies", 
-                "dos",  # Should be blocked
-                "fuzzing",  # Should be blocked
-                "misconfigurations"
-            ])
-            
-            # Verify dangerous templates are filtered out
-            assert "dos" not in authorized_templates
-            assert "fuzzing" not in authorized_templates
-            assert "cves" in authorized_templates
-            assert "default-logins" in authorized_templates
-            assert "misconfigurations" in authorized_templates
-
-    @pytest.mark.asyncio
+        # Test authorized template filtering
+        authorized_templates = nuclei_tool._filter_authorized_templates(list(_TEMPLATE_INPUT))
+        
+        # Verify dangerous templates are filtered out and the rest kept
+        assert frozenset(authorized_templates) == _EXPECTED_AUTHORIZED
+
     async def test_nuclei_cve_risk_evaluation(self, mock_scope_enforcer):
         """Test CVE risk evaluation workflow"""
         
@@ -226,7 +235,7 @@ class TestNucleiCVEWorkflow:
             "cvss_vector": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H",
             "host": "vulnerable-app.example.com",
             "matched_at": "https://vulnerable-app.example.com/login",
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": _FIXED_TS
         }
         
         # Mock risk evaluator to test different risk levels
@@ -240,215 +249,99 @@ class TestNucleiCVEWorkflow:
         # Verify risk evaluation considers CVSS score
         risk_evaluator.evaluate_cve_risk.assert_called_with(cve_finding)
 
-    @pytest.mark.asyncio
-    async def test_nuclei_json_parsing_edge_cases(self, mock_scope_enforcer):
+    async def test_nuclei_json_parsing_edge_cases(self, nuclei_tool):
         """Test Nuclei JSON parsing with edge cases"""
         
-        edge_case_json = json.dumps([
-            {
-                # CVE without CVSS score
-                "template": "CVE-2023-XXXX",
-                "template-id": "CVE-2023-XXXX",
-                "info": {
-                    "name": "Unknown CVE",
-                    "severity": "medium",
-                    "classification": {
-                        "cve-id": "CVE-2023-XXXX"
-                    }
-                },
-                "host": "example.com",
-                "matched-at": "https://example.com",
-                "timestamp": "2024-12-04T10:30:00.000Z"
-            },
-            {
-                # Finding without CVE
-                "template": "generic-tech-detection",
-                "template-id": "generic-tech",
-                "info": {
-                    "name": "Technology Detection",
-                    "severity": "info",
-                    "tags": ["tech"]
-                },
-                "host": "example.com",
-                "matched-at": "https://example.com",
-                "timestamp": "2024-12-04T10:30:00.000Z"
-            },
-            {
-                # Malformed JSON entry (missing required fields)
-                "template": "incomplete-finding",
-                "host": "example.com"
-            }
-        ])
+        with fast_nuclei_test_env(nuclei_tool, _EDGE_CASE_BYTES, "edge_case_scan.json") as (tool, _):
+            result = await tool.scan_with_validation(
+                targets=["https://example.com"]
+            )
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_dir = Path(temp_dir)
-            json_file = output_dir / "edge_case_scan.json"
-            json_file.write_text(edge_case_json)
-            
-            with patch('shutil.which', return_value='/usr/bin/nuclei'):
-                nuclei_tool = NucleiTool(
-                    scope_enforcer=mock_scope_enforcer,
-                    output_dir=str(output_dir)
-                )
-            
-            mock_process = Mock()
-            mock_process.returncode = 0
-            mock_process.communicate = AsyncMock(return_value=(
-                edge_case_json.encode(),
-                b""
-            ))
-            
-            with patch('asyncio.create_subprocess_exec', return_value=mock_process):
-                with patch.object(nuclei_tool, '_find_output_files', return_value=[str(json_file)]):
-                    result = await nuclei_tool.scan_with_validation(
-                        targets=["https://example.com"]
-                    )
-            
-            # Verify parsing handles edge cases gracefully
-            assert result.success is True
-            assert len(result.findings) >= 2  # At least valid findings processed
-            
-            # Verify CVE without CVSS is handled
-            cve_finding = next((f for f in result.findings if f.get('cve_id') == 'CVE-2023-XXXX'), None)
-            assert cve_finding is not None
-            assert cve_finding.get('cvss_score', 0.0) == 0.0
+        # Verify parsing handles edge cases gracefully
+        assert result.success is True
+        assert len(result.findings) >= 2  # At least valid findings processed
+        
+        # Verify CVE without CVSS is handled
+        cve_finding = next((f for f in result.findings if f.get('cve_id') == 'CVE-2023-XXXX'), None)
+        assert cve_finding is not None
+        assert cve_finding.get('cvss_score', 0.0) == 0.0
 
-    @pytest.mark.asyncio
-    async def test_nuclei_scope_validation_workflow(self, mock_risk_evaluator):
+    async def test_nuclei_scope_validation_workflow(self, nuclei_tool, mock_risk_evaluator):
         """Test Nuclei scope validation workflow"""
         
-        # Create scope enforcer that denies certain targets
-        mock_scope_enforcer = Mock(spec=ScopeEnforcementEngine)
-        mock_scope_enforcer.validate_action = AsyncMock(side_effect=[
+        # Create scope enforcer that approves the first target and denies the second
+        verdicts = (
             Mock(valid=True, message="Internal target approved"),
             Mock(valid=False, message="External target blocked")
-        ])
+        )
+        calls = 0
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('shutil.which', return_value='/usr/bin/nuclei'):
-                nuclei_tool = NucleiTool(
-                    scope_enforcer=mock_scope_enforcer,
-                    output_dir=temp_dir
-                )
-            
-            # Test mixed target validation
-            with pytest.raises(Exception):
-                await nuclei_tool.scan_with_validation(
-                    targets=["internal.company.com", "external-public-site.com"],
-                    template_categories=["cves"]
-                )
-            
-            # Verify scope validation called for each target
-            assert mock_scope_enforcer.validate_action.call_count == 2
+        async def validate_action(action):
+            nonlocal calls
+            verdict = verdicts[calls]
+            calls += 1
+            return verdict
+        
+        nuclei_tool.scope_enforcer = SimpleNamespace(validate_action=validate_action)
+        
+        # Test mixed target validation
+        with pytest.raises(Exception):
+            await nuclei_tool.scan_with_validation(
+                targets=["internal.company.com", "external-public-site.com"],
+                template_categories=["cves"]
+            )
+        
+        # Verify scope validation called for each target
+        assert calls == 2
 
-    @pytest.mark.asyncio
-    async def test_nuclei_severity_filtering(self, mock_scope_enforcer):
+    async def test_nuclei_severity_filtering(self, nuclei_tool):
         """Test Nuclei severity-based filtering"""
         
-        multi_severity_json = json.dumps([
-            {
-                "template": "critical-vuln",
-                "template-id": "critical-1",
-                "info": {"name": "Critical Vulnerability", "severity": "critical"},
-                "host": "example.com",
-                "matched-at": "https://example.com",
-                "timestamp": "2024-12-04T10:30:00.000Z"
-            },
-            {
-                "template": "high-vuln",
-                "template-id": "high-1", 
-                "info": {"name": "High Vulnerability", "severity": "high"},
-                "host": "example.com",
-                "matched-at": "https://example.com",
-                "timestamp": "2024-12-04T10:30:00.000Z"
-            },
-            {
-                "template": "medium-vuln",
-                "template-id": "medium-1",
-                "info": {"name": "Medium Vulnerability", "severity": "medium"},
-                "host": "example.com",
-                "matched-at": "https://example.com",
-                "timestamp": "2024-12-04T10:30:00.000Z"
-            },
-            {
-                "template": "low-info",
-                "template-id": "low-1",
-                "info": {"name": "Low Info", "severity": "low"},
-                "host": "example.com",
-                "matched-at": "https://example.com",
-                "timestamp": "2024-12-04T10:30:00.000Z"
-            }
-        ])
+        with fast_nuclei_test_env(nuclei_tool, _MULTI_SEVERITY_BYTES, "severity_test.json") as (tool, _):
+            # Test with critical and high only
+            result = await tool.scan_with_validation(
+                targets=["https://example.com"],
+                severity_filter=["critical", "high"]
+            )
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_dir = Path(temp_dir)
-            json_file = output_dir / "severity_test.json"
-            json_file.write_text(multi_severity_json)
-            
-            with patch('shutil.which', return_value='/usr/bin/nuclei'):
-                nuclei_tool = NucleiTool(
-                    scope_enforcer=mock_scope_enforcer,
-                    output_dir=str(output_dir)
-                )
-            
-            mock_process = Mock()
-            mock_process.returncode = 0
-            mock_process.communicate = AsyncMock(return_value=(
-                multi_severity_json.encode(),
-                b""
-            ))
-            
-            with patch('asyncio.create_subprocess_exec', return_value=mock_process):
-                with patch.object(nuclei_tool, '_find_output_files', return_value=[str(json_file)]):
-                    # Test with critical and high only
-                    result = await nuclei_tool.scan_with_validation(
-                        targets=["https://example.com"],
-                        severity_filter=["critical", "high"]
-                    )
-            
-            # Verify severity filtering in command construction
-            # This would be tested by checking the actual command args passed to subprocess
-            assert result.success is True
+        # Verify severity filtering in command construction
+        # This would be tested by checking the actual command args passed to subprocess
+        assert result.success is True
 
-    @pytest.mark.asyncio
-    async def test_nuclei_concurrent_scans(self, mock_scope_enforcer):
+    async def test_nuclei_concurrent_scans(self, nuclei_tool):
         """Test concurrent Nuclei vulnerability scans"""
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('shutil.which', return_value='/usr/bin/nuclei'):
-                nuclei_tool = NucleiTool(
-                    scope_enforcer=mock_scope_enforcer,
-                    output_dir=temp_dir
-                )
-            
-            # Mock successful scans
-            mock_process = Mock()
-            mock_process.returncode = 0
-            mock_process.communicate = AsyncMock(return_value=(
-                b'[{"template":"test","host":"example.com","matched-at":"https://example.com","timestamp":"2024-12-04T10:30:00.000Z"}]',
-                b""
-            ))
-            
-            with patch('asyncio.create_subprocess_exec', return_value=mock_process):
-                # Execute concurrent scans
-                targets = [f"app{i}.example.com" for i in range(1, 6)]
-                tasks = [
-                    nuclei_tool.scan_with_validation(
-                        targets=[target],
-                        template_categories=["cves"]
-                    )
-                    for target in targets
-                ]
-                
-                results = await asyncio.gather(*tasks, return_exceptions=True)
+        mock_scope_enforcer = _counting_enforcer(
+            return_value=SimpleNamespace(valid=True, message="Target approved")
+        )
+        nuclei_tool.scope_enforcer = mock_scope_enforcer
+        
+        targets = [f"app{i}.example.com" for i in range(1, 6)]
+        payload = b'[{"template":"test","host":"example.com","matched-at":"https://example.com","timestamp":"2024-12-04T10:30:00.000Z"}]'
+        
+        # Mock successful scans: one preallocated (stdout, stderr) pair per scan
+        mock_process = Mock()
+        mock_process.returncode = 0
+        mock_process.communicate = AsyncMock(side_effect=[(payload, b"")] * len(targets))
+        
+        with patch('asyncio.create_subprocess_exec', return_value=mock_process):
+            # Schedule every scan before awaiting any, then check each as soon as it finishes
+            tasks = [
+                asyncio.ensure_future(nuclei_tool.scan_with_validation(
+                    targets=[target],
+                    template_categories=["cves"]
+                ))
+                for target in targets
+            ]
             
-            # Verify all scans completed successfully
-            for result in results:
-                assert not isinstance(result, Exception)
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
                 assert result.success is True
-            
-            # Verify scope validation called for each target
-            assert mock_scope_enforcer.validate_action.call_count == 5
+        
+        assert mock_process.communicate.await_count == len(targets)
+        
+        # Verify scope validation called for each target
+        assert mock_scope_enforcer.validate_action.call_count == 5
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -12,10 +12,11 @@ Tests for the resilient A2A client including:
 
 import pytest
 import asyncio
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, AsyncMock, patch
-import uuid
 
+from app.agents.shared.a2a_client import resilient_client as resilient_client_module
+from app.agents.shared.a2a_client.mock_client import InMemoryA2AClient
 from app.agents.shared.a2a_client.resilient_client import (
     ResilientA2AClient,
     ResilientClientConfig,
@@ -33,6 +34,53 @@ from app.agents.shared.a2a_client.resilient_client import (
 from app.agents.shared.models.a2a_models import A2ATask, TaskStatus
 
 
+# Task returned by base client mocks; tests only read it, so one instance is shared
+_SAMPLE_TASK = A2ATask(
+    task_id="00000000-0000-0000-0000-000000000001",
+    task_type="test_task",
+    status=TaskStatus.PENDING,
+    context={"key": "value"}
+)
+
+# Configs are only read by CircuitBreaker/ResilientA2AClient, so one instance serves every test.
+# The client keeps the default 60s recovery_timeout: its tests run on the real clock.
+_BREAKER_CFG = CircuitBreakerConfig(
+    failure_threshold=3,
+    recovery_timeout=0.001,  # ~1ms even if a test ever runs on the real clock
+    success_threshold=2
+)
+_DEFAULT_CFG = ResilientClientConfig(
+    retry=RetryConfig(max_attempts=3, initial_delay=0.0, jitter=False),  # no backoff delay between retries
+    timeout=TimeoutConfig(default_timeout=5.0, task_timeout=10.0),
+    circuit_breaker=CircuitBreakerConfig(failure_threshold=3),
+    resource_limits=ResourceLimits(max_concurrent_tasks=5)
+)
+
+# Base A2A client mock built once; fixtures reset it instead of constructing new AsyncMocks
+_BASE_CLIENT = Mock(create_task=AsyncMock(), get_task_status=AsyncMock(), close=AsyncMock())
+
+
+class _VirtualClock:
+    """Stands in for the resilient client module's datetime; time only moves on advance()"""
+
+    def __init__(self):
+        self._now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def now(self, tz=None):
+        return self._now
+
+    def advance(self, seconds: float):
+        self._now += timedelta(seconds=seconds)
+
+
+@pytest.fixture
+def virtual_clock(monkeypatch):
+    """Freeze the clock CircuitBreaker reads; tests move it with virtual_clock.advance()"""
+    clock = _VirtualClock()
+    monkeypatch.setattr(resilient_client_module, "datetime", clock)
+    return clock
+
+
 class TestRetryConfig:
     """Tests for RetryConfig"""
 
@@ -71,118 +119,83 @@ class TestTimeoutConfig:
         assert config.task_timeout == 300.0
 
 
+@pytest.mark.asyncio(scope="class")
 class TestCircuitBreaker:
     """Tests for CircuitBreaker"""
 
     @pytest.fixture
-    def circuit_breaker(self):
+    def circuit_breaker(self, virtual_clock):
         """Create circuit breaker with test config"""
-        config = CircuitBreakerConfig(
-            failure_threshold=3,
-            recovery_timeout=1.0,  # Short for testing
-            success_threshold=2
-        )
-        return CircuitBreaker(config)
-
-    @pytest.mark.asyncio
-    async def test_initial_state_closed(self, circuit_breaker):
-        """Test circuit breaker starts in closed state"""
-        assert circuit_breaker.state == CircuitState.CLOSED
-        assert await circuit_breaker.can_execute() is True
-
-    @pytest.mark.asyncio
-    async def test_opens_after_threshold_failures(self, circuit_breaker):
-        """Test circuit opens after reaching failure threshold"""
-        # Record failures up to threshold
-        for _ in range(3):
-            await circuit_breaker.record_failure()
-
-        assert circuit_breaker.state == CircuitState.OPEN
-        assert await circuit_breaker.can_execute() is False
-
-    @pytest.mark.asyncio
-    async def test_transitions_to_half_open(self, circuit_breaker):
-        """Test circuit transitions to half-open after recovery timeout"""
-        # Open the circuit
-        for _ in range(3):
-            await circuit_breaker.record_failure()
-
-        assert circuit_breaker.state == CircuitState.OPEN
-
-        # Wait for recovery timeout
-        await asyncio.sleep(1.1)
-
-        # Should transition to half-open
-        assert await circuit_breaker.can_execute() is True
-        assert circuit_breaker.state == CircuitState.HALF_OPEN
-
-    @pytest.mark.asyncio
-    async def test_closes_after_success_in_half_open(self, circuit_breaker):
-        """Test circuit closes after successes in half-open state"""
-        # Open the circuit
-        for _ in range(3):
-            await circuit_breaker.record_failure()
-
-        # Wait for recovery
-        await asyncio.sleep(1.1)
-        await circuit_breaker.can_execute()
-
-        # Record successes
-        await circuit_breaker.record_success()
-        await circuit_breaker.record_success()
-
-        assert circuit_breaker.state == CircuitState.CLOSED
-
-    @pytest.mark.asyncio
-    async def test_reopens_on_failure_in_half_open(self, circuit_breaker):
-        """Test circuit reopens on failure in half-open state"""
-        # Open the circuit
-        for _ in range(3):
-            await circuit_breaker.record_failure()
-
-        # Wait for recovery
-        await asyncio.sleep(1.1)
-        await circuit_breaker.can_execute()
-
-        # Fail in half-open
-        await circuit_breaker.record_failure()
-
-        assert circuit_breaker.state == CircuitState.OPEN
-
-
+        return CircuitBreaker(_BREAKER_CFG)
+
+    # (action, state after it); "probe" also checks can_execute() is False only while OPEN
+    TRANSITIONS = {
+        "recovers_after_successes": [
+            ("probe", CircuitState.CLOSED),
+            ("fail", CircuitState.CLOSED),
+            ("fail", CircuitState.CLOSED),
+            ("fail", CircuitState.OPEN),
+            ("probe", CircuitState.OPEN),
+            ("advance_clock", CircuitState.OPEN),
+            ("probe", CircuitState.HALF_OPEN),
+            ("succeed", CircuitState.HALF_OPEN),
+            ("succeed", CircuitState.CLOSED),
+        ],
+        "reopens_on_half_open_failure": [
+            ("fail", CircuitState.CLOSED),
+            ("fail", CircuitState.CLOSED),
+            ("fail", CircuitState.OPEN),
+            ("advance_clock", CircuitState.OPEN),
+            ("probe", CircuitState.HALF_OPEN),
+            ("fail", CircuitState.OPEN),
+        ],
+    }
+
+    @pytest.mark.parametrize("steps", list(TRANSITIONS.values()), ids=list(TRANSITIONS))
+    async def test_state_transitions(self, circuit_breaker, virtual_clock, steps):
+        """Walk the breaker through a sequence of events, checking state after each"""
+        for action, expected_state in steps:
+            if action == "probe":
+                allowed = await circuit_breaker.can_execute()
+                assert allowed is (expected_state != CircuitState.OPEN)
+            elif action == "fail":
+                await circuit_breaker.record_failure()
+            elif action == "succeed":
+                await circuit_breaker.record_success()
+            elif action == "advance_clock":
+                virtual_clock.advance(circuit_breaker.config.recovery_timeout)
+
+            assert circuit_breaker.state == expected_state, f"after {action}"
+
+
+@pytest.mark.asyncio(scope="class")
 class TestResilientA2AClient:
-    """Tests for ResilientA2AClient"""
+    """Tests for ResilientA2AClient (one event loop and client for the whole class)"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def mock_base_client(self):
-        """Create mock base client"""
-        client = Mock()
-        client.create_task = AsyncMock()
-        client.get_task_status = AsyncMock()
-        client.close = AsyncMock()
-        return client
+        """Prebuilt base client mock, reset for this class"""
+        _BASE_CLIENT.reset_mock(return_value=True, side_effect=True)
+        return _BASE_CLIENT
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def resilient_client(self, mock_base_client):
         """Create resilient client with mock base"""
-        config = ResilientClientConfig(
-            retry=RetryConfig(max_attempts=3, initial_delay=0.1, jitter=False),
-            timeout=TimeoutConfig(default_timeout=5.0, task_timeout=10.0),
-            circuit_breaker=CircuitBreakerConfig(failure_threshold=3),
-            resource_limits=ResourceLimits(max_concurrent_tasks=5)
-        )
-        return ResilientA2AClient(mock_base_client, config)
+        return ResilientA2AClient(mock_base_client, _DEFAULT_CFG)
+
+    @pytest.fixture(autouse=True)
+    def _reset(self, resilient_client, mock_base_client):
+        """Undo per-test changes to the shared client and base mock"""
+        create_task = mock_base_client.create_task
+        yield
+        mock_base_client.create_task = create_task
+        mock_base_client.reset_mock(return_value=True, side_effect=True)
+        resilient_client._circuit_breakers.clear()
+        resilient_client._active_tasks.clear()
 
-    @pytest.mark.asyncio
     async def test_create_task_success(self, resilient_client, mock_base_client):
         """Test successful task creation"""
-        expected_task = A2ATask(
-            task_id=str(uuid.uuid4()),
-            task_type="test_task",
-            status=TaskStatus.PENDING,
-            context={"key": "value"}
-        )
-        mock_base_client.create_task.return_value = expected_task
+        mock_base_client.create_task.return_value = _SAMPLE_TASK
 
         task = await resilient_client.create_task(
             agent_url="http://test-agent:8000",
@@ -190,16 +203,15 @@ class TestResilientA2AClient:
             context={"key": "value"}
         )
 
-        assert task.task_id == expected_task.task_id
+        assert task.task_id == _SAMPLE_TASK.task_id
         assert task.task_type == "test_task"
         mock_base_client.create_task.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_create_task_timeout(self, resilient_client, mock_base_client):
         """Test task creation timeout - should raise MaxRetriesExceededError after retries"""
         async def slow_create(*args, **kwargs):
-            await asyncio.sleep(10)
-            return A2ATask(task_id="test", task_type="test", status=TaskStatus.PENDING)
+            # Hang on a future nothing resolves; no timer is scheduled
+            return await asyncio.get_running_loop().create_future()
 
         mock_base_client.create_task = slow_create
 
@@ -212,23 +224,13 @@ class TestResilientA2AClient:
                 timeout=0.1
             )
 
-    @pytest.mark.asyncio
     async def test_retry_on_connection_error(self, resilient_client, mock_base_client):
         """Test retry on connection errors"""
-        call_count = 0
-
-        async def failing_then_success(*args, **kwargs):
-            nonlocal call_count
-            call_count += 1
-            if call_count < 3:
-                raise ConnectionError("Connection failed")
-            return A2ATask(
-                task_id="test",
-                task_type="test_task",
-                status=TaskStatus.PENDING
-            )
-
-        mock_base_client.create_task = failing_then_success
+        mock_base_client.create_task.side_effect = [
+            ConnectionError("Connection failed"),
+            ConnectionError("Connection failed"),
+            _SAMPLE_TASK,
+        ]
 
         task = await resilient_client.create_task(
             agent_url="http://test-agent:8000",
@@ -236,15 +238,12 @@ class TestResilientA2AClient:
             context={}
         )
 
-        assert task is not None
-        assert call_count == 3
+        assert task is _SAMPLE_TASK
+        assert mock_base_client.create_task.await_count == 3
 
-    @pytest.mark.asyncio
     async def test_max_retries_exceeded(self, resilient_client, mock_base_client):
         """Test max retries exceeded error"""
-        mock_base_client.create_task = AsyncMock(
-            side_effect=ConnectionError("Always fails")
-        )
+        mock_base_client.create_task.side_effect = ConnectionError("Always fails")
 
         with pytest.raises(MaxRetriesExceededError) as exc_info:
             await resilient_client.create_task(
@@ -255,68 +254,39 @@ class TestResilientA2AClient:
 
         assert exc_info.value.attempts == 3
         assert "Always fails" in str(exc_info.value.last_error)
+        assert mock_base_client.create_task.await_count == 3
 
-    @pytest.mark.asyncio
     async def test_circuit_breaker_opens(self, resilient_client, mock_base_client):
         """Test circuit breaker opens after failures"""
-        mock_base_client.create_task = AsyncMock(
-            side_effect=ConnectionError("Connection failed")
-        )
-
-        # Trigger multiple failures to open circuit
+        # Record failures up to the threshold directly on the agent's breaker
+        circuit_breaker = resilient_client._get_circuit_breaker("http://test-agent:8000")
         for _ in range(3):
-            try:
-                await resilient_client.create_task(
-                    agent_url="http://test-agent:8000",
-                    task_type="test_task",
-                    context={}
-                )
-            except (MaxRetriesExceededError, CircuitOpenError):
-                pass
-
-        # Circuit should be open now
+            await circuit_breaker.record_failure()
+
+        # Circuit should be open now, rejecting calls before they reach the agent
         with pytest.raises(CircuitOpenError):
             await resilient_client.create_task(
                 agent_url="http://test-agent:8000",
                 task_type="test_task",
                 context={}
             )
+        mock_base_client.create_task.assert_not_awaited()
 
-    @pytest.mark.asyncio
-    async def test_task_cancellation(self, resilient_client, mock_base_client):
+    async def test_task_cancellation(self, resilient_client):
         """Test task cancellation"""
-        task_id = str(uuid.uuid4())
-
-        # Start a long-running task
-        async def long_task(*args, **kwargs):
-            await asyncio.sleep(100)
-            return A2ATask(task_id=task_id, task_type="test", status=TaskStatus.COMPLETED)
-
-        mock_base_client.create_task = long_task
-
-        # Start task in background
-        task_future = asyncio.create_task(
-            resilient_client.create_task(
-                agent_url="http://test-agent:8000",
-                task_type="test_task",
-                context={}
-            )
-        )
+        # Track a task that never finishes on its own, as create_task_with_wait does
+        async def hang():
+            await asyncio.get_running_loop().create_future()
 
-        # Give it time to start
-        await asyncio.sleep(0.1)
+        # The group cancels the task itself if cancel_all_tasks fails, so nothing leaks
+        async with asyncio.TaskGroup() as tg:
+            tracked = tg.create_task(hang())
+            resilient_client._active_tasks["task-1"] = tracked
+            await resilient_client.cancel_all_tasks()
 
-        # Cancel (note: this tests the internal task tracking)
-        await resilient_client.cancel_all_tasks()
+        assert tracked.cancelled()
+        assert resilient_client._active_tasks == {}
 
-        # The future should be cancelled
-        task_future.cancel()
-        try:
-            await task_future
-        except asyncio.CancelledError:
-            pass
-
-    @pytest.mark.asyncio
     async def test_resource_usage(self, resilient_client):
         """Test resource usage reporting"""
         usage = resilient_client.get_resource_usage()
@@ -326,15 +296,10 @@ class TestResilientA2AClient:
         assert "available_slots" in usage
         assert usage["max_concurrent_tasks"] == 5
 
-    @pytest.mark.asyncio
     async def test_circuit_breaker_status(self, resilient_client, mock_base_client):
         """Test circuit breaker status reporting"""
         # Make a successful call to register the circuit breaker
-        mock_base_client.create_task.return_value = A2ATask(
-            task_id="test",
-            task_type="test",
-            status=TaskStatus.PENDING
-        )
+        mock_base_client.create_task.return_value = _SAMPLE_TASK
 
         await resilient_client.create_task(
             agent_url="http://test-agent:8000",
@@ -379,24 +344,37 @@ class TestCreateResilientClient:
         assert resilient_client.config.circuit_breaker.failure_threshold == 10
 
 
+@pytest.mark.asyncio(scope="class")
 class TestIntegrationWithMockClient:
     """Integration tests with InMemoryA2AClient"""
 
-    @pytest.mark.asyncio
-    async def test_resilient_mock_client_integration(self):
-        """Test resilient client wrapping mock client"""
-        from app.agents.shared.a2a_client.mock_client import InMemoryA2AClient
+    @pytest.fixture(scope="class")
+    def test_agent(self):
+        """Agent stub whose handled event is set each time it handles a task"""
+        agent = Mock()
+        agent.handled = asyncio.Event()
 
-        # Create mock client and register a test agent
-        mock_client = InMemoryA2AClient()
+        async def handle_task(task):
+            agent.handled.set()
+            return {"result": "completed"}
 
-        test_agent = Mock()
-        test_agent.handle_task = AsyncMock(return_value={"result": "success"})
-        mock_client.register("test-agent", test_agent)
+        agent.handle_task = handle_task
+        return agent
+
+    @pytest.fixture(scope="class")
+    def mock_mem_client(self, test_agent):
+        """InMemoryA2AClient with test_agent registered once for the class"""
+        client = InMemoryA2AClient()
+        client.register("test-agent", test_agent)
+        return client
+
+    async def test_resilient_mock_client_integration(self, mock_mem_client, test_agent):
+        """Test resilient client wrapping mock client"""
+        test_agent.handled.clear()
 
         # Wrap with resilient client
         resilient_client = create_resilient_client(
-            mock_client,
+            mock_mem_client,
             max_retries=2,
             default_timeout=5.0
         )
@@ -411,8 +389,8 @@ class TestIntegrationWithMockClient:
         assert task is not None
         assert task.task_type == "test_task"
 
-        # Wait a bit for async execution
-        await asyncio.sleep(0.2)
+        # Wait for the agent to pick the task up
+        await asyncio.wait_for(test_agent.handled.wait(), timeout=1.0)
 
         # Check task status
         status = await resilient_client.get_task_status(
@@ -422,19 +400,10 @@ class TestIntegrationWithMockClient:
 
         assert status.status in [TaskStatus.COMPLETED, TaskStatus.IN_PROGRESS]
 
-    @pytest.mark.asyncio
-    async def test_resilient_client_with_wait(self):
+    async def test_resilient_client_with_wait(self, mock_mem_client):
         """Test resilient client create_task_with_wait"""
-        from app.agents.shared.a2a_client.mock_client import InMemoryA2AClient
-
-        mock_client = InMemoryA2AClient()
-
-        test_agent = Mock()
-        test_agent.handle_task = AsyncMock(return_value={"result": "completed"})
-        mock_client.register("test-agent", test_agent)
-
         resilient_client = create_resilient_client(
-            mock_client,
+            mock_mem_client,
             task_timeout=5.0
         )
 
@@ -444,40 +413,49 @@ class TestIntegrationWithMockClient:
             task_type="test_task",
             context={"input": "test"},
             max_wait_time=5.0,
-            poll_interval=0.1
+            poll_interval=0.001
         )
 
         assert task.status == TaskStatus.COMPLETED
 
 
+_CONNECTION_REFUSED = ConnectionError("Connection refused")
+
+
 class TestExceptionTypes:
     """Tests for custom exception types"""
 
-    def test_task_timeout_error(self):
-        """Test TaskTimeoutError"""
-        error = TaskTimeoutError("task-123", 30.0)
-        assert error.task_id == "task-123"
-        assert error.timeout == 30.0
-        assert "task-123" in str(error)
-        assert "30" in str(error)
-
-    def test_task_timeout_error_custom_message(self):
-        """Test TaskTimeoutError with custom message"""
-        error = TaskTimeoutError("task-123", 30.0, "Custom timeout message")
-        assert error.message == "Custom timeout message"
-
-    def test_circuit_open_error(self):
-        """Test CircuitOpenError"""
-        error = CircuitOpenError("http://test:8000")
-        assert error.agent_url == "http://test:8000"
-        assert "http://test:8000" in str(error)
-
-    def test_max_retries_exceeded_error(self):
-        """Test MaxRetriesExceededError"""
-        original_error = ConnectionError("Connection refused")
-        error = MaxRetriesExceededError("create_task", 3, original_error)
-        assert error.operation == "create_task"
-        assert error.attempts == 3
-        assert error.last_error == original_error
-        assert "3" in str(error)
-        assert "create_task" in str(error)
+    @pytest.mark.parametrize("factory,attrs,substrings", [
+        pytest.param(
+            lambda: TaskTimeoutError("task-123", 30.0),
+            {"task_id": "task-123", "timeout": 30.0},
+            ["task-123", "30"],
+            id="task_timeout",
+        ),
+        pytest.param(
+            lambda: TaskTimeoutError("task-123", 30.0, "Custom timeout message"),
+            {"message": "Custom timeout message"},
+            ["Custom timeout message"],
+            id="task_timeout_custom_message",
+        ),
+        pytest.param(
+            lambda: CircuitOpenError("http://test:8000"),
+            {"agent_url": "http://test:8000"},
+            ["http://test:8000"],
+            id="circuit_open",
+        ),
+        pytest.param(
+            lambda: MaxRetriesExceededError("create_task", 3, _CONNECTION_REFUSED),
+            {"operation": "create_task", "attempts": 3, "last_error": _CONNECTION_REFUSED},
+            ["3", "create_task"],
+            id="max_retries_exceeded",
+        ),
+    ])
+    def test_exception(self, factory, attrs, substrings):
+        """Exception stores its arguments and mentions them in its message"""
+        error = factory()
+        for name, value in attrs.items():
+            assert getattr(error, name) == value
+        message = str(error)
+        for substring in substrings:
+            assert substring in message
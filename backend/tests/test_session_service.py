@@ -12,9 +12,9 @@ Tests for the SessionService class covering:
 
 import pytest
 import asyncio
+from types import SimpleNamespace
 from datetime import datetime, timezone, timedelta
-from unittest.mock import Mock, AsyncMock, MagicMock, patch
-from sqlalchemy.ext.asyncio import AsyncSession
+from unittest.mock import Mock
 import uuid
 
 from app.services.session_service import SessionService, get_session_service
@@ -25,63 +25,104 @@ from app.schemas.session import (
 from app.models.models import Session as DBSession, Task, Artifact
 
 
+_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+_ST_COMPLETED = SessionStatus.COMPLETED
+_ST_ACTIVE = SessionStatus.ACTIVE
+
+
+def _make_refresh(sid="test-session-id"):
+    """Build a db.refresh stand-in that fills in the server-generated columns"""
+    async def _refresh(obj):
+        obj.id = sid
+        obj.created_at = _NOW
+        obj.updated_at = _NOW
+    return _refresh
+
+
+# Read-only request payloads (known-good input, so skip validation)
+_CREATE_NEW = SessionCreate.model_construct(
+    title="New Session",
+    description="A new test session",
+    requirements_text="Build a REST API"
+)
+_CREATE_USER = SessionCreate.model_construct(title="User Session", requirements_text="User requirements")
+_CREATE_ERROR = SessionCreate.model_construct(title="Error Session", requirements_text="Will fail")
+_CREATE_LIFECYCLE = SessionCreate.model_construct(title="Lifecycle Test", requirements_text="Test the full lifecycle")
+_UPDATE_TITLE = SessionUpdate.model_construct(title="Updated Title", status=_ST_COMPLETED)
+_UPDATE_NEW_TITLE = SessionUpdate.model_construct(title="New Title")
+_UPDATE_DESCRIPTION_ONLY = SessionUpdate.model_construct(description="New description only")
+_UPDATE_ADDED_DESCRIPTION = SessionUpdate.model_construct(description="Added description")
+
+
+# Read-only task/artifact rows for the statistics test
+_STATS_TASKS = [
+    SimpleNamespace(status="completed", quality_score=0.9, processing_time=10.5),
+    SimpleNamespace(status="completed", quality_score=0.8, processing_time=15.0),
+    SimpleNamespace(status="pending", quality_score=None, processing_time=None),
+    SimpleNamespace(status="failed", quality_score=None, processing_time=5.0),
+]
+_STATS_ARTIFACTS = [object(), object()]
+
+
+def _make_db_session():
+    """Build the sample database session model"""
+    return DBSession(
+        id=str(uuid.uuid4()),
+        title="Test Session",
+        description="Test description",
+        requirements_text="Test requirements",
+        status="active",
+        created_at=_NOW,
+        updated_at=_NOW
+    )
+
+
+@pytest.fixture
+def stub_scalar(mock_db_session):
+    """Make db.execute return a canned result; a list value doubles as scalars()/fetchall() rows"""
+    def _stub(value=None, rowcount=0):
+        rows = value if isinstance(value, list) else []
+        result = SimpleNamespace(
+            scalar_one_or_none=lambda: value,
+            scalars=lambda: SimpleNamespace(all=lambda: rows),
+            fetchall=lambda: rows,
+            rowcount=rowcount,
+        )
+        mock_db_session.execute.return_value = result
+        return result
+    return _stub
+
+
 class TestSessionService:
     """Test suite for SessionService"""
 
-    @pytest.fixture
-    def mock_db_session(self):
-        """Create mock database session"""
-        session = Mock(spec=AsyncSession)
-        session.add = Mock()
-        session.commit = AsyncMock()
-        session.rollback = AsyncMock()
-        session.refresh = AsyncMock()
-        session.delete = AsyncMock()
-        session.execute = AsyncMock()
-        return session
-
     @pytest.fixture
     def session_service(self, mock_db_session):
         """Create SessionService instance with mock db"""
         return SessionService(mock_db_session)
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_db_session(self):
-        """Create sample database session model"""
-        return DBSession(
-            id=str(uuid.uuid4()),
-            title="Test Session",
-            description="Test description",
-            requirements_text="Test requirements",
-            status="active",
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
-        )
+        """Shared sample database session model (read-only; mutating tests use fresh_db_session)"""
+        return _make_db_session()
+
+    @pytest.fixture
+    def fresh_db_session(self):
+        """Per-test sample database session model for tests that modify it"""
+        return _make_db_session()
 
     # ===================
     # Create Session Tests
     # ===================
 
-    @pytest.mark.asyncio
     async def test_create_session_success(self, session_service, mock_db_session):
         """Test successful session creation"""
         # Arrange
-        create_data = SessionCreate(
-            title="New Session",
-            description="A new test session",
-            requirements_text="Build a REST API"
-        )
-
         # Mock refresh to set the session attributes
-        async def mock_refresh(obj):
-            obj.id = str(uuid.uuid4())
-            obj.created_at = datetime.now(timezone.utc)
-            obj.updated_at = datetime.now(timezone.utc)
-
-        mock_db_session.refresh = mock_refresh
+        mock_db_session.refresh = _make_refresh()
 
         # Act
-        result = await session_service.create_session(create_data)
+        result = await session_service.create_session(_CREATE_NEW)
 
         # Assert
         assert result is not None
@@ -90,38 +131,24 @@ class TestSessionService:
         mock_db_session.add.assert_called_once()
         mock_db_session.commit.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_create_session_with_user_id(self, session_service, mock_db_session):
         """Test session creation with user ID"""
-        create_data = SessionCreate(
-            title="User Session",
-            requirements_text="User requirements"
-        )
-
-        async def mock_refresh(obj):
-            obj.id = str(uuid.uuid4())
-            obj.created_at = datetime.now(timezone.utc)
-            obj.updated_at = datetime.now(timezone.utc)
+        mock_db_session.refresh = _make_refresh()
 
-        mock_db_session.refresh = mock_refresh
-
-        result = await session_service.create_session(create_data, user_id="user-123")
+        result = await session_service.create_session(_CREATE_USER, user_id="user-123")
 
         assert result is not None
         assert result.title == "User Session"
 
-    @pytest.mark.asyncio
     async def test_create_session_db_error(self, session_service, mock_db_session):
         """Test session creation handles database errors"""
-        create_data = SessionCreate(
-            title="Error Session",
-            requirements_text="Will fail"
-        )
+        async def _raise():
+            raise Exception("Database error")
 
-        mock_db_session.commit = AsyncMock(side_effect=Exception("Database error"))
+        mock_db_session.commit = _raise
 
         with pytest.raises(Exception) as exc_info:
-            await session_service.create_session(create_data)
+            await session_service.create_session(_CREATE_ERROR)
 
         assert "Database error" in str(exc_info.value)
         mock_db_session.rollback.assert_called_once()
@@ -130,13 +157,9 @@ class TestSessionService:
     # Get Session Tests
     # ===================
 
-    @pytest.mark.asyncio
-    async def test_get_session_found(self, session_service, mock_db_session, sample_db_session):
+    async def test_get_session_found(self, session_service, stub_scalar, sample_db_session):
         """Test retrieving existing session"""
-        # Mock execute to return the sample session
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = sample_db_session
-        mock_db_session.execute.return_value = mock_result
+        stub_scalar(sample_db_session)
 
         result = await session_service.get_session(sample_db_session.id)
 
@@ -144,39 +167,39 @@ class TestSessionService:
         assert result.id == sample_db_session.id
         assert result.title == "Test Session"
 
-    @pytest.mark.asyncio
-    async def test_get_session_not_found(self, session_service, mock_db_session):
-        """Test retrieving non-existent session"""
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db_session.execute.return_value = mock_result
+    @pytest.mark.parametrize("method,args,expected", [
+        ("get_session", ("non-existent-id",), None),
+        ("update_session", ("non-existent", _UPDATE_NEW_TITLE), None),
+        ("delete_session", ("non-existent",), False),
+        ("get_session_statistics", ("non-existent",), {}),
+    ])
+    async def test_session_not_found(self, session_service, stub_scalar, method, args, expected):
+        """Test lookups, updates, deletes and statistics for a non-existent session"""
+        stub_scalar()
 
-        result = await session_service.get_session("non-existent-id")
+        result = await getattr(session_service, method)(*args)
 
-        assert result is None
+        assert result == expected
 
-    @pytest.mark.asyncio
-    async def test_get_session_with_tasks(self, session_service, mock_db_session, sample_db_session):
+    async def test_get_session_with_tasks(self, session_service, stub_scalar, fresh_db_session):
         """Test retrieving session with related tasks"""
         # Add mock tasks
-        sample_db_session.tasks = [
+        fresh_db_session.tasks = [
             Mock(
                 id="task-1",
                 task_type="analysis",
                 agent_id="analyzer",
                 status="completed",
                 priority="high",
-                created_at=datetime.now(timezone.utc),
+                created_at=_NOW,
                 quality_score=0.95
             )
         ]
 
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = sample_db_session
-        mock_db_session.execute.return_value = mock_result
+        stub_scalar(fresh_db_session)
 
         result = await session_service.get_session(
-            sample_db_session.id,
+            fresh_db_session.id,
             include_tasks=True
         )
 
@@ -188,47 +211,21 @@ class TestSessionService:
     # Update Session Tests
     # ===================
 
-    @pytest.mark.asyncio
-    async def test_update_session_success(self, session_service, mock_db_session, sample_db_session):
+    async def test_update_session_success(self, session_service, mock_db_session, stub_scalar, fresh_db_session):
         """Test successful session update"""
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = sample_db_session
-        mock_db_session.execute.return_value = mock_result
+        stub_scalar(fresh_db_session)
 
-        update_data = SessionUpdate(
-            title="Updated Title",
-            status=SessionStatus.COMPLETED
-        )
-
-        result = await session_service.update_session(sample_db_session.id, update_data)
+        result = await session_service.update_session(fresh_db_session.id, _UPDATE_TITLE)
 
         assert result is not None
         mock_db_session.commit.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_update_session_not_found(self, session_service, mock_db_session):
-        """Test updating non-existent session"""
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db_session.execute.return_value = mock_result
-
-        update_data = SessionUpdate(title="New Title")
-
-        result = await session_service.update_session("non-existent", update_data)
-
-        assert result is None
-
-    @pytest.mark.asyncio
-    async def test_update_session_partial(self, session_service, mock_db_session, sample_db_session):
+    async def test_update_session_partial(self, session_service, stub_scalar, fresh_db_session):
         """Test partial session update (only some fields)"""
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = sample_db_session
-        mock_db_session.execute.return_value = mock_result
+        stub_scalar(fresh_db_session)
 
         # Only update description
-        update_data = SessionUpdate(description="New description only")
-
-        result = await session_service.update_session(sample_db_session.id, update_data)
+        result = await session_service.update_session(fresh_db_session.id, _UPDATE_DESCRIPTION_ONLY)
 
         assert result is not None
 
@@ -236,12 +233,9 @@ class TestSessionService:
     # Delete Session Tests
     # ===================
 
-    @pytest.mark.asyncio
-    async def test_delete_session_success(self, session_service, mock_db_session, sample_db_session):
+    async def test_delete_session_success(self, session_service, mock_db_session, stub_scalar, sample_db_session):
         """Test successful session deletion"""
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = sample_db_session
-        mock_db_session.execute.return_value = mock_result
+        stub_scalar(sample_db_session)
 
         result = await session_service.delete_session(sample_db_session.id)
 
@@ -249,55 +243,29 @@ class TestSessionService:
         mock_db_session.delete.assert_called_once_with(sample_db_session)
         mock_db_session.commit.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_delete_session_not_found(self, session_service, mock_db_session):
-        """Test deleting non-existent session"""
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db_session.execute.return_value = mock_result
-
-        result = await session_service.delete_session("non-existent")
-
-        assert result is False
-
     # ===================
     # List Sessions Tests
     # ===================
 
-    @pytest.mark.asyncio
-    async def test_list_sessions_empty(self, session_service, mock_db_session):
+    async def test_list_sessions_empty(self, session_service, stub_scalar):
         """Test listing sessions when none exist"""
-        mock_result = Mock()
-        mock_scalars = Mock()
-        mock_scalars.all.return_value = []
-        mock_result.scalars.return_value = mock_scalars
-        mock_db_session.execute.return_value = mock_result
+        stub_scalar()
 
         result = await session_service.list_sessions()
 
         assert result == []
 
-    @pytest.mark.asyncio
-    async def test_list_sessions_with_filter(self, session_service, mock_db_session, sample_db_session):
+    async def test_list_sessions_with_filter(self, session_service, stub_scalar, sample_db_session):
         """Test listing sessions with status filter"""
-        mock_result = Mock()
-        mock_scalars = Mock()
-        mock_scalars.all.return_value = [sample_db_session]
-        mock_result.scalars.return_value = mock_scalars
-        mock_db_session.execute.return_value = mock_result
+        stub_scalar([sample_db_session])
 
-        result = await session_service.list_sessions(status=SessionStatus.ACTIVE)
+        result = await session_service.list_sessions(status=_ST_ACTIVE)
 
         assert len(result) == 1
 
-    @pytest.mark.asyncio
-    async def test_list_sessions_pagination(self, session_service, mock_db_session):
+    async def test_list_sessions_pagination(self, session_service, mock_db_session, stub_scalar):
         """Test listing sessions with pagination"""
-        mock_result = Mock()
-        mock_scalars = Mock()
-        mock_scalars.all.return_value = []
-        mock_result.scalars.return_value = mock_scalars
-        mock_db_session.execute.return_value = mock_result
+        stub_scalar()
 
         result = await session_service.list_sessions(limit=10, offset=20)
 
@@ -309,23 +277,18 @@ class TestSessionService:
     # Session Statistics Tests
     # ===================
 
-    @pytest.mark.asyncio
-    async def test_get_session_statistics(self, session_service, mock_db_session, sample_db_session):
+    async def test_get_session_statistics(self, session_service, stub_scalar):
         """Test getting session statistics"""
-        # Add mock tasks with various statuses
-        sample_db_session.tasks = [
-            Mock(status="completed", quality_score=0.9, processing_time=10.5),
-            Mock(status="completed", quality_score=0.8, processing_time=15.0),
-            Mock(status="pending", quality_score=None, processing_time=None),
-            Mock(status="failed", quality_score=None, processing_time=5.0),
-        ]
-        sample_db_session.artifacts = [Mock(), Mock()]
-
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = sample_db_session
-        mock_db_session.execute.return_value = mock_result
+        # Plain row with tasks of various statuses (the ORM relationship rejects non-mapped items)
+        stub_scalar(SimpleNamespace(
+            status="active",
+            created_at=_NOW,
+            updated_at=_NOW,
+            tasks=_STATS_TASKS,
+            artifacts=_STATS_ARTIFACTS,
+        ))
 
-        stats = await session_service.get_session_statistics(sample_db_session.id)
+        stats = await session_service.get_session_statistics("stats-session")
 
         assert stats["tasks"]["total"] == 4
         assert stats["tasks"]["completed"] == 2
@@ -335,40 +298,23 @@ class TestSessionService:
         assert stats["average_quality_score"] == 0.85
         assert stats["completion_percentage"] == 50.0
 
-    @pytest.mark.asyncio
-    async def test_get_session_statistics_not_found(self, session_service, mock_db_session):
-        """Test getting statistics for non-existent session"""
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db_session.execute.return_value = mock_result
-
-        stats = await session_service.get_session_statistics("non-existent")
-
-        assert stats == {}
-
     # ===================
     # Cleanup Tests
     # ===================
 
-    @pytest.mark.asyncio
-    async def test_cleanup_expired_sessions(self, session_service, mock_db_session):
+    async def test_cleanup_expired_sessions(self, session_service, mock_db_session, stub_scalar):
         """Test cleanup of expired sessions"""
         # Mock finding expired sessions
-        mock_result = Mock()
-        mock_result.fetchall.return_value = [("session-1",), ("session-2",)]
-        mock_db_session.execute.return_value = mock_result
+        stub_scalar([("session-1",), ("session-2",)])
 
         count = await session_service.cleanup_expired_sessions(max_age_days=30)
 
         assert count == 2
         mock_db_session.commit.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_cleanup_no_expired_sessions(self, session_service, mock_db_session):
+    async def test_cleanup_no_expired_sessions(self, session_service, stub_scalar):
         """Test cleanup when no sessions are expired"""
-        mock_result = Mock()
-        mock_result.fetchall.return_value = []
-        mock_db_session.execute.return_value = mock_result
+        stub_scalar()
 
         count = await session_service.cleanup_expired_sessions(max_age_days=30)
 
@@ -378,31 +324,25 @@ class TestSessionService:
     # Status Update Tests
     # ===================
 
-    @pytest.mark.asyncio
-    async def test_update_session_status_success(self, session_service, mock_db_session):
+    async def test_update_session_status_success(self, session_service, mock_db_session, stub_scalar):
         """Test updating session status"""
-        mock_result = Mock()
-        mock_result.rowcount = 1
-        mock_db_session.execute.return_value = mock_result
+        stub_scalar(rowcount=1)
 
         result = await session_service.update_session_status(
             "session-123",
-            SessionStatus.COMPLETED
+            _ST_COMPLETED
         )
 
         assert result is True
         mock_db_session.commit.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_update_session_status_not_found(self, session_service, mock_db_session):
+    async def test_update_session_status_not_found(self, session_service, stub_scalar):
         """Test updating status of non-existent session"""
-        mock_result = Mock()
-        mock_result.rowcount = 0
-        mock_db_session.execute.return_value = mock_result
+        stub_scalar(rowcount=0)
 
         result = await session_service.update_session_status(
             "non-existent",
-            SessionStatus.COMPLETED
+            _ST_COMPLETED
         )
 
         assert result is False
@@ -411,7 +351,6 @@ class TestSessionService:
     # Factory Function Tests
     # ===================
 
-    @pytest.mark.asyncio
     async def test_get_session_service_factory(self, mock_db_session):
         """Test factory function creates service correctly"""
         service = await get_session_service(mock_db_session)
@@ -423,36 +362,15 @@ class TestSessionService:
 class TestSessionServiceIntegration:
     """Integration-style tests for SessionService (still using mocks but testing workflows)"""
 
-    @pytest.fixture
-    def mock_db_session(self):
-        """Create comprehensive mock database session"""
-        session = Mock(spec=AsyncSession)
-        session.add = Mock()
-        session.commit = AsyncMock()
-        session.rollback = AsyncMock()
-        session.refresh = AsyncMock()
-        session.delete = AsyncMock()
-        session.execute = AsyncMock()
-        return session
-
-    @pytest.mark.asyncio
-    async def test_full_session_lifecycle(self, mock_db_session):
+    @pytest.mark.slow
+    async def test_full_session_lifecycle(self, mock_db_session, stub_scalar):
         """Test complete session lifecycle: create -> update -> complete -> delete"""
         service = SessionService(mock_db_session)
 
         # 1. Create session
-        async def mock_refresh_create(obj):
-            obj.id = "lifecycle-session-123"
-            obj.created_at = datetime.now(timezone.utc)
-            obj.updated_at = datetime.now(timezone.utc)
-
-        mock_db_session.refresh = mock_refresh_create
+        mock_db_session.refresh = _make_refresh("lifecycle-session-123")
 
-        create_data = SessionCreate(
-            title="Lifecycle Test",
-            requirements_text="Test the full lifecycle"
-        )
-        created = await service.create_session(create_data)
+        created = await service.create_session(_CREATE_LIFECYCLE)
         assert created.title == "Lifecycle Test"
 
         # 2. Update session
@@ -462,27 +380,23 @@ class TestSessionServiceIntegration:
             description=None,
             requirements_text="Test the full lifecycle",
             status="active",
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+            created_at=_NOW,
+            updated_at=_NOW
         )
 
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = sample_session
-        mock_db_session.execute.return_value = mock_result
+        result = stub_scalar(sample_session)
 
-        update_data = SessionUpdate(description="Added description")
-        updated = await service.update_session("lifecycle-session-123", update_data)
+        updated = await service.update_session("lifecycle-session-123", _UPDATE_ADDED_DESCRIPTION)
         assert updated is not None
 
         # 3. Update status to completed
-        mock_result.rowcount = 1
+        result.rowcount = 1
         status_updated = await service.update_session_status(
             "lifecycle-session-123",
-            SessionStatus.COMPLETED
+            _ST_COMPLETED
         )
         assert status_updated is True
 
         # 4. Delete session
-        mock_result.scalar_one_or_none.return_value = sample_session
         deleted = await service.delete_session("lifecycle-session-123")
         assert deleted is True